@@ -0,0 +1,56 @@
+"""
+Benchmark the computation of colexification networks on synthetic data.
+
+Usage:
+
+    python benchmarks/colexifications.py [--languages N] [--concepts N] [--families N] [--partial]
+
+Each language expresses each concept with one random form. Forms are drawn from a vocabulary
+per language which is smaller than the number of concepts, to produce colexifications.
+"""
+import sys
+import time
+import random
+import resource
+import argparse
+
+from cltoolkit.colexifications import colexifications, partial_colexifications
+
+
+class Obj:
+    __slots__ = ('id', 'family', 'concept', 'language', 'form')
+
+    def __init__(self, **kw):
+        for k in self.__slots__:
+            setattr(self, k, kw.get(k))
+
+
+def forms(args):
+    rnd = random.Random(42)
+    concepts = [Obj(id='concept-{}'.format(i)) for i in range(args.concepts)]
+    for i in range(args.languages):
+        language = Obj(id='language-{}'.format(i), family='family-{}'.format(i % args.families))
+        vocabulary = ['form-{}'.format(j) for j in range(int(args.concepts * 0.9))]
+        for concept in concepts:
+            yield Obj(concept=concept, language=language, form=rnd.choice(vocabulary))
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--languages', type=int, default=1000)
+    parser.add_argument('--concepts', type=int, default=1000)
+    parser.add_argument('--families', type=int, default=100)
+    parser.add_argument(
+        '--partial', action='store_true', default=False, help='Compute partial colexifications')
+    args = parser.parse_args(args)
+
+    start = time.perf_counter()
+    edges = (partial_colexifications if args.partial else colexifications)(forms(args))
+    print('languages: {}, concepts: {}, edges: {}'.format(
+        args.languages, args.concepts, len(edges)))
+    print('time: {:.1f}s, max. RSS: {:.0f}MB'.format(
+        time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Benchmark garbage collection pauses while loading and discarding wordlists.
+
+Usage:
+
+    python benchmarks/gc_pause.py [--rounds N] [--clts PATH] [METADATA_JSON ...]
+
+If no CLDF metadata files are given, the datasets in `tests/repos` are used.
+"""
+import gc
+import sys
+import time
+import logging
+import pathlib
+import argparse
+
+from pycldf import Dataset
+from pyclts import CLTS
+
+from cltoolkit import Wordlist
+
+REPOS = pathlib.Path(__file__).parent.parent / 'tests' / 'repos'
+
+
+class GCTimer:
+    """
+    Record the duration of each garbage collection via `gc.callbacks`.
+    """
+    def __init__(self):
+        self.pauses, self._start = [], None
+
+    def __call__(self, phase, info):
+        if phase == 'start':
+            self._start = time.perf_counter()
+        elif self._start is not None:
+            self.pauses.append((info['generation'], time.perf_counter() - self._start))
+            self._start = None
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('metadata', nargs='*', type=pathlib.Path)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--clts', type=pathlib.Path, default=REPOS / 'clts')
+    args = parser.parse_args(args)
+    logging.getLogger('lingpy').setLevel(logging.WARNING)
+
+    datasets = [Dataset.from_metadata(p) for p in args.metadata or [
+        REPOS / name / 'cldf' / 'cldf-metadata.json' for name in ['carvalhopurus', 'wangbcd']]]
+    bipa = CLTS(args.clts).bipa
+
+    timer = GCTimer()
+    gc.collect()
+    gc.callbacks.append(timer)
+    try:
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            wl = Wordlist(datasets, bipa)
+            for language in wl.languages:
+                _ = language.sound_inventory
+            del wl, _
+        total = time.perf_counter() - start
+        start = time.perf_counter()
+        unreachable = gc.collect()
+        final = time.perf_counter() - start
+    finally:
+        gc.callbacks.remove(timer)
+
+    pauses = [p for _, p in timer.pauses]
+    print('rounds: {}, total time: {:.2f}s'.format(args.rounds, total))
+    print('collections: {} (generation 2: {}), total pause: {:.4f}s, max pause: {:.4f}s'.format(
+        len(pauses),
+        len([g for g, _ in timer.pauses if g == 2]),
+        sum(pauses),
+        max(pauses, default=0)))
+    print('objects left for the final collection: {} ({:.4f}s)'.format(unreachable, final))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
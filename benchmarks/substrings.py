@@ -0,0 +1,117 @@
+"""
+Benchmark the computation of substring-based lexical features.
+
+Compares the implementations of `SharedSubstring` and `PartialColexification` with the
+exhaustive pairwise comparison of forms.
+
+Usage:
+
+    python benchmarks/substrings.py [--rounds N] [--clts PATH] [METADATA_JSON ...]
+    python benchmarks/substrings.py --synthetic LENGTH [--rounds N]
+
+If no CLDF metadata files are given, the datasets in `tests/repos` are used. With `--synthetic`,
+the features are computed for random forms of the given length instead.
+"""
+import sys
+import time
+import random
+import logging
+import pathlib
+import argparse
+import itertools
+
+from pycldf import Dataset
+from pyclts import CLTS
+
+from cltoolkit import Wordlist
+from cltoolkit.features import FEATURES
+from cltoolkit.features.lexicon import SharedSubstring, PartialColexification
+
+REPOS = pathlib.Path(__file__).parent.parent / 'tests' / 'repos'
+
+
+def pairwise_shared_substring(aforms, bforms):
+    for aform, bform in itertools.product(aforms, bforms):
+        for i in range(1, len(aform) - 1):
+            morphA = aform[:i]
+            morphB = aform[i:]
+            if len(morphA) >= 3 and morphA in bform and bform != morphA:
+                return True
+            if len(morphB) >= 3 and morphB in bform and bform != morphA:
+                return True
+    if aforms and bforms:
+        return False
+
+
+def pairwise_partial_colexification(aforms, bforms):
+    for aform, bform in itertools.product(aforms, bforms):
+        if bform.startswith(aform) and len(aform) > 2 and len(bform) > 5:
+            return True
+        if bform.endswith(aform) and len(aform) > 2 and len(bform) > 5:
+            return True
+    if aforms and bforms:
+        return False
+
+
+PAIRWISE = {
+    SharedSubstring: pairwise_shared_substring,
+    PartialColexification: pairwise_partial_colexification,
+}
+
+
+def languages(wl, features):
+    """
+    Yields, per language, the forms to compare per feature.
+    """
+    for language in wl.languages:
+        yield [f.function.forms(language) for f in features]
+
+
+def synthetic(features, length, size=100):
+    """
+    Yields random forms of the given length, i.e. forms which rarely share substrings - the worst
+    case for the pairwise comparison.
+    """
+    rnd = random.Random(42)
+    for _ in range(size):
+        yield [tuple(
+            [''.join(rnd.choice('ptkbdgmnslrwjaeiou') for _ in range(length))
+             for _ in range(rnd.randint(1, 3))] for _ in range(2)) + ([],) for _ in features]
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('metadata', nargs='*', type=pathlib.Path)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--clts', type=pathlib.Path, default=REPOS / 'clts')
+    parser.add_argument('--synthetic', type=int, default=None)
+    args = parser.parse_args(args)
+    logging.getLogger('lingpy').setLevel(logging.WARNING)
+
+    features = [f for f in FEATURES if type(f.function) in PAIRWISE]
+    if args.synthetic:
+        data = list(synthetic(features, args.synthetic))
+    else:
+        datasets = [Dataset.from_metadata(p) for p in args.metadata or [
+            REPOS / name / 'cldf' / 'cldf-metadata.json' for name in ['features', 'wangbcd']]]
+        data = list(languages(Wordlist(datasets, CLTS(args.clts).bipa), features))
+
+    timings, mismatches = [0, 0], 0
+    for _ in range(args.rounds):
+        for forms in data:
+            start = time.perf_counter()
+            expected = [
+                PAIRWISE[type(f.function)](a, b) for f, (a, b, _) in zip(features, forms)]
+            timings[0] += time.perf_counter() - start
+            start = time.perf_counter()
+            res = [f.function.run(*ff) for f, ff in zip(features, forms)]
+            timings[1] += time.perf_counter() - start
+            mismatches += sum(1 for i, j in zip(expected, res) if i is not j)
+
+    print('languages: {}, features: {}, rounds: {}'.format(len(data), len(features), args.rounds))
+    print('pairwise: {:.4f}s, cltoolkit: {:.4f}s'.format(*timings))
+    print('mismatches: {}'.format(mismatches))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
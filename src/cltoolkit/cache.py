@@ -0,0 +1,203 @@
+"""
+Caching of lazily computed attributes of data objects.
+
+Derived data like sound inventories of languages is computed when first accessed. To keep the
+memory footprint of long-running processes in check, these values are not stored on the objects,
+but in a :class:`CacheManager` of the wordlist the objects belong to, which evicts the least
+recently used values when its budget is exceeded.
+
+Both, the cache manager and the descriptors for lazily computed attributes, are thread-safe: When
+several threads access an attribute concurrently for the first time, the value is computed only
+once. Cached values are read without acquiring a lock, locks are only held (per object and
+attribute) while a value is computed.
+"""
+import threading
+import collections
+
+from cltoolkit.util import clear_reference_errors
+
+__all__ = ['CacheInfo', 'CacheManager', 'cached_property', 'lazyproperty']
+
+CacheInfo = collections.namedtuple(
+    'CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize', 'maxitems', 'curritems'])
+
+
+def weight(value):
+    """
+    The number of items in a cached value - or 1 for values without length.
+    """
+    try:
+        return max(len(value), 1)
+    except TypeError:
+        return 1
+
+
+class CacheManager:
+    """
+    A least-recently-used cache for lazily computed attributes of data objects.
+
+    .. code-block:: python
+
+        >>> wl = Wordlist(datasets, ts=clts.bipa, cache=CacheManager(maxsize=1000))
+        >>> for language in wl.languages:
+        ...     _ = language.sound_inventory
+        >>> wl.cache.cache_info()
+        CacheInfo(hits=0, misses=..., evictions=..., maxsize=1000, currsize=1000, ...)
+
+    :param maxsize: Maximal number of cached values, or `None` for no limit.
+    :param maxitems: Maximal number of items in all cached values (see :func:`weight`), as proxy \
+        for the memory held by the cache, or `None` for no limit.
+    """
+    def __init__(self, maxsize=None, maxitems=None):
+        self.maxsize = maxsize
+        self.maxitems = maxitems
+        self.hits = self.misses = self.evictions = 0
+        self._items = 0
+        # Maps (id(obj), name) to [obj, value, weight, used].
+        self._cache = collections.OrderedDict()
+        # Maps keys of values which are being computed to locks, held by the computing thread.
+        self._pending = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._cache)
+
+    def _lookup(self, key, obj):
+        entry = self._cache.get(key)
+        # Since the object is stored in the entry, its id cannot be re-used while it is cached.
+        if entry is not None and entry[0] is obj:
+            # Rather than re-ordering the cache - which would require the lock - we only flag the
+            # entry as used, to give it a second chance upon eviction.
+            entry[3] = True
+            self.hits += 1
+            return entry
+        return None
+
+    def get(self, obj, name, compute):
+        """
+        Retrieve the cached value for attribute `name` of `obj`, computing it if necessary.
+
+        .. note::
+
+            Cache hits do not acquire a lock, thus the `hits` count is approximate when the cache
+            is accessed from several threads.
+
+        :param compute: Callable accepting `obj` as sole argument, computing the value.
+        """
+        key = (id(obj), name)
+        entry = self._lookup(key, obj)
+        if entry is not None:
+            return entry[1]
+
+        with self._lock:
+            lock = self._pending.setdefault(key, threading.Lock())
+
+        with lock:
+            # Another thread may have computed the value while we were waiting for the lock.
+            entry = self._lookup(key, obj)
+            if entry is not None:
+                return entry[1]
+            try:
+                value = compute(obj)
+                with self._lock:
+                    self.misses += 1
+                    # A lookup may have missed an entry while it was moved upon eviction.
+                    old = self._cache.pop(key, None)
+                    if old is not None:
+                        self._items -= old[2]
+                    self._cache[key] = [obj, value, weight(value), False]
+                    self._items += self._cache[key][2]
+                    self._evict()
+            finally:
+                with self._lock:
+                    if self._pending.get(key) is lock:
+                        del self._pending[key]
+        return value
+
+    def _evict(self):
+        # Approximates LRU order ("second chance"): Entries which have been used since they were
+        # added (or last considered for eviction) are moved to the end rather than evicted.
+        while self._cache and (
+                (self.maxsize is not None and len(self._cache) > self.maxsize) or  # noqa: W504
+                (self.maxitems is not None and self._items > self.maxitems)):
+            key, entry = self._cache.popitem(last=False)
+            if entry[3]:
+                entry[3] = False
+                self._cache[key] = entry
+                continue
+            self._items -= entry[2]
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Remove all values from the cache.
+        """
+        with self._lock:
+            self._cache.clear()
+            self._items = 0
+
+    def cache_info(self):
+        with self._lock:
+            return CacheInfo(
+                self.hits,
+                self.misses,
+                self.evictions,
+                self.maxsize,
+                len(self._cache),
+                self.maxitems,
+                self._items)
+
+
+class lazyproperty:
+    """
+    Thread-safe descriptor for lazily computed attributes, caching the value as instance attribute.
+    """
+    def __init__(self, fget):
+        self.fget = fget
+        # Maps ids of objects for which the value is being computed to locks.
+        self._pending = {}
+        self._lock = threading.Lock()
+        for attr in ('__module__', '__name__', '__doc__'):
+            setattr(self, attr, getattr(fget, attr))
+
+    @clear_reference_errors
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        # Once the value is set as instance attribute, the descriptor will not be called
+        # anymore - except by threads which accessed the attribute before.
+        try:
+            return obj.__dict__[self.__name__]
+        except KeyError:
+            pass
+
+        key = id(obj)
+        with self._lock:
+            lock = self._pending.setdefault(key, threading.Lock())
+        with lock:
+            try:
+                if self.__name__ not in obj.__dict__:
+                    obj.__dict__[self.__name__] = self.fget(obj)
+            finally:
+                with self._lock:
+                    if self._pending.get(key) is lock:
+                        del self._pending[key]
+            return obj.__dict__[self.__name__]
+
+
+class cached_property(lazyproperty):
+    """
+    Thread-safe descriptor for lazily computed attributes of data objects.
+
+    Values are cached in the :class:`CacheManager` available as `cache` attribute of the wordlist
+    of the object. For objects which do not belong to a wordlist, the value is cached as instance
+    attribute.
+    """
+    @clear_reference_errors
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        cache = getattr(getattr(obj, 'wordlist', None), 'cache', None)
+        if cache is None:
+            return lazyproperty.__get__(self, obj, objtype=objtype)
+        return cache.get(obj, self.__name__, self.fget)
@@ -0,0 +1,185 @@
+"""
+Colexification networks.
+
+Two concepts are colexified in a language, if they are expressed with the same form. While
+:class:`cltoolkit.features.lexicon.Colexification` checks one pair of concepts for one language,
+:func:`colexifications` computes the colexifications of all pairs of concepts for all languages,
+i.e. a network with concepts as nodes and edges weighted by the number of languages and families
+colexifying the concepts.
+
+Similarly, :func:`partial_colexifications` computes the directed network of partial
+colexifications (see :class:`cltoolkit.features.lexicon.PartialColexification`) for all pairs of
+concepts.
+
+.. code-block:: python
+
+    >>> edges = wl.colexifications(min_languages=2)
+    >>> write_edges(edges, 'colexifications.tsv.gz')
+"""
+import gzip
+import pathlib
+import itertools
+import collections
+
+import attr
+
+__all__ = ['Edge', 'colexifications', 'partial_colexifications', 'write_edges', 'read_edges']
+
+COLUMNS = ['Source', 'Target', 'Languages', 'Families']
+
+
+@attr.s(slots=True)
+class Edge:
+    """
+    An edge of a colexification network.
+
+    :ivar languages: Number of languages in which the concepts are colexified.
+    :ivar families: Number of language families in which the concepts are colexified. Languages \
+    without family count as families of their own.
+    """
+    source = attr.ib()
+    target = attr.ib()
+    languages = attr.ib(default=0, converter=int)
+    families = attr.ib(default=0, converter=int)
+
+
+def _weighted_edges(pairs_by_language, families, min_languages):
+    """
+    Aggregate the concept pairs found per language into weighted edges.
+    """
+    edges = {}
+    for lid, pairs in pairs_by_language:
+        for pair in pairs:
+            edge = edges.get(pair)
+            if edge is None:
+                edge = edges[pair] = [0, set()]
+            edge[0] += 1
+            edge[1].add(families[lid])
+    return sorted(
+        (Edge(source, target, nl, len(fams))
+         for (source, target), (nl, fams) in edges.items() if nl >= min_languages),
+        key=lambda e: (-e.languages, -e.families, e.source, e.target))
+
+
+def _index(forms):
+    """
+    Join forms on language and form string in one pass.
+
+    :return: pair (`dict` mapping language IDs to `dict` s mapping form strings to concept IDs \
+    or `set` s of concept IDs, `dict` mapping language IDs to families)
+    """
+    index, families = collections.defaultdict(dict), {}
+    for form in forms:
+        if form.concept is None or not form.form:
+            continue
+        lid, cid = form.language.id, form.concept.id
+        if lid not in families:
+            families[lid] = form.language.family or (None, lid)
+        concepts = index[lid].get(form.form)
+        # Most form strings express only one concept, so we only create sets when needed.
+        if concepts is None:
+            index[lid][form.form] = cid
+        elif isinstance(concepts, set):
+            concepts.add(cid)
+        elif concepts != cid:
+            index[lid][form.form] = {concepts, cid}
+    return index, families
+
+
+def colexifications(forms, min_languages=1) -> list:
+    """
+    Compute the colexifications of all pairs of concepts.
+
+    :param forms: Iterable of :class:`cltoolkit.models.Form` objects, e.g. `Wordlist.forms`.
+    :param min_languages: Minimal number of languages colexifying two concepts.
+    :return: `list` of :class:`Edge` objects - with `source` and `target` sorted \
+    alphabetically - sorted by descending number of languages.
+    """
+    index, families = _index(forms)
+
+    def pairs_by_language():
+        for lid, concepts_by_form in index.items():
+            pairs = set()
+            for concepts in concepts_by_form.values():
+                if isinstance(concepts, set):
+                    pairs.update(itertools.combinations(sorted(concepts), 2))
+            yield lid, pairs
+
+    return _weighted_edges(pairs_by_language(), families, min_languages)
+
+
+def _as_set(concepts):
+    return concepts if isinstance(concepts, set) else {concepts}
+
+
+def partial_colexifications(forms, min_languages=1) -> list:
+    """
+    Compute the partial colexifications of all pairs of concepts, i.e. the pairs of concepts A
+    and B, such that a form for A (with more than two characters) is a prefix or suffix of a form
+    for B (with more than five characters).
+
+    Rather than comparing all pairs of forms, the prefixes and suffixes of each form are looked up
+    in the index of form strings of the language, i.e. the computation is linear in the number of
+    forms per language (times the length of the forms).
+
+    .. note::
+
+        As in :class:`cltoolkit.features.lexicon.PartialColexification`, a form counts as prefix
+        of itself, i.e. concepts colexified with forms of more than five characters are partially
+        colexified in both directions.
+
+    :param forms: Iterable of :class:`cltoolkit.models.Form` objects, e.g. `Wordlist.forms`.
+    :param min_languages: Minimal number of languages partially colexifying two concepts.
+    :return: `list` of :class:`Edge` objects - with `source` the concept for the affix - sorted \
+    by descending number of languages.
+    """
+    index, families = _index(forms)
+
+    def pairs_by_language():
+        for lid, concepts_by_form in index.items():
+            pairs = set()
+            for bform, bconcepts in concepts_by_form.items():
+                n = len(bform)
+                if n <= 5:
+                    continue
+                for affix in {bform[:i] for i in range(3, n + 1)} | \
+                        {bform[-i:] for i in range(3, n + 1)}:
+                    if affix in concepts_by_form:
+                        pairs.update(
+                            (a, b) for a, b in itertools.product(
+                                _as_set(concepts_by_form[affix]), _as_set(bconcepts)) if a != b)
+            yield lid, pairs
+
+    return _weighted_edges(pairs_by_language(), families, min_languages)
+
+
+def _open(path, mode):
+    path = pathlib.Path(path)
+    if path.suffix == '.gz':
+        return gzip.open(str(path), mode + 't', encoding='utf8')
+    return path.open(mode, encoding='utf8')
+
+
+def write_edges(edges, path):
+    """
+    Write edges to a tab-separated edge list, gzipped if `path` ends with `.gz`.
+
+    :param edges: Iterable of :class:`Edge` objects, written while iterating.
+    :return: Number of edges written.
+    """
+    n = 0
+    with _open(path, 'w') as f:
+        f.write('\t'.join(COLUMNS) + '\n')
+        for n, edge in enumerate(edges, start=1):
+            f.write('{0.source}\t{0.target}\t{0.languages}\t{0.families}\n'.format(edge))
+    return n
+
+
+def read_edges(path):
+    """
+    Read edges written with :func:`write_edges`.
+    """
+    with _open(path, 'r') as f:
+        next(f)
+        for line in f:
+            yield Edge(*line.rstrip('\n').split('\t'))
@@ -0,0 +1,146 @@
+"""
+Persistent cache for feature values.
+
+Feature values are stored in an SQLite database, keyed by
+
+- the specification of the feature function (see :meth:`cltoolkit.features.Feature.to_json`),
+- the content fingerprint of the language (see
+  :attr:`cltoolkit.models.WithForms.content_fingerprint`),
+- the version of `cltoolkit` and the data of the transcription system (see
+  :func:`cltoolkit.util.ts_version`).
+
+Thus, values are re-used for languages with the same content - even if the language IDs differ.
+
+.. code-block:: python
+
+    >>> with ResultCache('features.sqlite', max_age=30 * 24 * 60 * 60) as cache:
+    ...     matrix = FEATURES.compute(wl, cache=cache)
+
+.. note::
+
+    Feature functions are expected to depend only on the forms of a language (and data derived
+    from the forms like the sound inventory), not on metadata of the language.
+"""
+import json
+import time
+import pathlib
+import sqlite3
+
+import cltoolkit
+from cltoolkit.util import fingerprint, ts_version
+
+__all__ = ['ResultCache']
+
+
+class ResultCache:
+    """
+    :param path: Path of the SQLite database file.
+    :param maxsize: Maximal number of values to keep when calling `ResultCache.evict`.
+    :param max_age: Maximal time in seconds since the last access of a value to keep it when \
+    calling `ResultCache.evict`.
+    """
+    def __init__(self, path, maxsize=None, max_age=None):
+        self.path = pathlib.Path(path)
+        self.maxsize = maxsize
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(str(self.path))
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS result "
+                "(key BLOB PRIMARY KEY, value TEXT, accessed REAL) WITHOUT ROWID")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return self._conn.execute("SELECT count(*) FROM result").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+    @staticmethod
+    def feature_key(feature, ts=None) -> str:
+        """
+        Compute the part of the key identifying a feature (for a transcription system).
+        """
+        return fingerprint(
+            json.dumps(feature.to_json()['function'], sort_keys=True, default=str),
+            cltoolkit.__version__,
+            ts_version(ts))
+
+    @staticmethod
+    def key(feature_key, language) -> bytes:
+        return bytes.fromhex(fingerprint(feature_key, language.content_fingerprint))
+
+    def get(self, keys) -> dict:
+        """
+        Retrieve cached values.
+
+        :param keys: Iterable of keys as computed with `ResultCache.key`.
+        :return: `dict` mapping the keys found in the cache to the values.
+        """
+        keys, res = list(keys), {}
+        # Split the keys into chunks, to stay below SQLite's limit on the number of parameters.
+        for i in range(0, len(keys), 500):
+            chunk, found = keys[i:i + 500], []
+            for key, value in self._conn.execute(
+                    "SELECT key, value FROM result WHERE key IN ({})".format(
+                        ','.join('?' * len(chunk))),
+                    chunk):
+                res[key] = json.loads(value)
+                found.append(key)
+            if found:
+                with self._conn:
+                    self._conn.execute(
+                        "UPDATE result SET accessed = ? WHERE key IN ({})".format(
+                            ','.join('?' * len(found))),
+                        [time.time()] + found)
+        self.hits += len(res)
+        self.misses += len(keys) - len(res)
+        return res
+
+    def set(self, items):
+        """
+        :param items: `dict` mapping keys to values.
+
+        .. note::
+
+            Values are stored as JSON. Values which would not be retrieved unchanged - e.g.
+            `tuple` s or `dict` s with non-string keys - are not stored.
+        """
+        now = time.time()
+        rows = []
+        for key, value in items.items():
+            try:
+                serialized = json.dumps(value)
+            except (TypeError, ValueError):
+                continue
+            if json.loads(serialized) == value:
+                rows.append((key, serialized, now))
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO result (key, value, accessed) VALUES (?, ?, ?)", rows)
+
+    def evict(self):
+        """
+        Remove values which haven't been accessed for `max_age` seconds and the least recently
+        accessed values exceeding `maxsize`.
+        """
+        with self._conn:
+            if self.max_age is not None:
+                self._conn.execute(
+                    "DELETE FROM result WHERE accessed < ?", (time.time() - self.max_age,))
+            if self.maxsize is not None:
+                self._conn.execute(
+                    "DELETE FROM result WHERE key IN "
+                    "(SELECT key FROM result ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.maxsize,))
+
+    def clear(self):
+        with self._conn:
+            self._conn.execute("DELETE FROM result")
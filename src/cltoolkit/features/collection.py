@@ -1,14 +1,25 @@
 import typing
+import inspect
 import textwrap
 import importlib
 import collections
+import multiprocessing
+import concurrent.futures
 
 import attr
 from pycldf.util import DictTuple
 from clldutils import jsonlib
 
+from cltoolkit.features.reqs import MissingRequirement, eligible
+from cltoolkit.features.matrix import FeatureMatrix
+from cltoolkit.features.intermediates import Intermediates
+
 __all__ = ['Feature', 'FeatureCollection', 'get_callable']
 
+# The `_Worker` of a worker process of `FeatureCollection.iter_values`. Since each worker process
+# belongs to exactly one pool, this is per-pool state.
+_WORKER = None
+
 
 def get_callable(s: typing.Union[str, dict, typing.Callable]) -> typing.Callable:
     """
@@ -31,6 +42,17 @@ def get_callable(s: typing.Union[str, dict, typing.Callable]) -> typing.Callable
     raise ValueError(s)
 
 
+def accepts_intermediates(func: typing.Callable) -> bool:
+    """
+    Whether the callable `func` accepts a keyword argument `intermediates`.
+    """
+    try:
+        params = inspect.signature(func).parameters
+    except (TypeError, ValueError):  # pragma: no cover
+        return False
+    return 'intermediates' in params or any(p.kind == p.VAR_KEYWORD for p in params.values())
+
+
 @attr.s(repr=False)
 class Feature:
     """
@@ -53,9 +75,11 @@ class Feature:
             self.categories = self.function.categories
         if hasattr(self.function, 'rtype'):
             self.type = self.function.rtype
-        func = getattr(self.function, '__call__', self.function)
-        if hasattr(func, 'requires'):
-            self.requires = func.requires
+        for func in [self.function, getattr(self.function, '__call__', None)]:
+            # Requirements may be declared for feature functions or for `__call__` methods.
+            if hasattr(func, 'requires'):
+                self.requires = func.requires
+        self._accepts_intermediates = accepts_intermediates(self.function)
 
     def to_json(self) -> dict:
         def j(o, field=None):
@@ -86,7 +110,26 @@ class Feature:
     def help(self):
         print(self.doc)
 
-    def __call__(self, param):
+    @property
+    def intermediates(self) -> list:
+        """
+        Names of the intermediates used by the feature function.
+
+        .. note::
+
+            Intermediates are only used if the feature function accepts a keyword argument
+            `intermediates` - e.g. not if a subclass of a feature class declaring intermediates
+            overrides `__call__` with signature `__call__(self, language)`.
+
+        .. seealso:: :mod:`cltoolkit.features.intermediates`
+        """
+        if not self._accepts_intermediates:
+            return []
+        return list(getattr(self.function, 'intermediates', None) or [])
+
+    def __call__(self, param, intermediates=None):
+        if intermediates is not None and self.intermediates:
+            return self.function(param, intermediates=intermediates)
         return self.function(param)
 
     def __repr__(self):
@@ -112,3 +155,162 @@ class FeatureCollection(DictTuple):
 
     def __call__(self, feature, language):
         return self[feature](language)
+
+    def plan(self) -> collections.OrderedDict:
+        """
+        The intermediates used by the features in the collection.
+
+        :return: `OrderedDict` mapping names of intermediates to lists of IDs of features using \
+        them.
+        """
+        res = collections.OrderedDict()
+        for feature in self:
+            for name in feature.intermediates:
+                res.setdefault(name, []).append(feature.id)
+        return res
+
+    def explain(self):
+        """
+        Print the intermediates which are computed once per language and shared between features.
+        """
+        plan = self.plan()
+        for name, fids in plan.items():
+            print('{} ({} features): {}'.format(name, len(fids), ', '.join(fids)))
+        fids = [f.id for f in self if not f.intermediates]
+        if fids:
+            print('without intermediates ({} features): {}'.format(len(fids), ', '.join(fids)))
+
+    def values(self, language, features=None) -> collections.OrderedDict:
+        """
+        Compute the values of all features for a language.
+
+        Features are only called if the language meets their declared requirements (see
+        :func:`cltoolkit.features.reqs.eligible`). Intermediates are computed once and shared
+        between the features (see :mod:`cltoolkit.features.intermediates`).
+
+        :param features: Iterable of feature IDs, to compute only a subset of the features.
+        :return: `OrderedDict` mapping feature IDs to values, with `None` for features the \
+        requirements of which are not met by the language.
+        """
+        res, intermediates = collections.OrderedDict(), Intermediates(language)
+        for feature in (self if features is None else [self[fid] for fid in features]):
+            if not eligible(feature, language):
+                res[feature.id] = None
+                continue
+            try:
+                res[feature.id] = feature(language, intermediates=intermediates)
+            except MissingRequirement:
+                res[feature.id] = None
+        return res
+
+    def iter_values(self, wl, languages=None, jobs=None, threads=None, cache=None):
+        """
+        Compute the values of all features for languages of a wordlist.
+
+        Languages are processed either in `jobs` worker processes or in `threads` threads. Since
+        lazily computed attributes of the data objects are thread-safe, threads can share the
+        wordlist; speed-ups are to be expected only on free-threaded Python builds, though.
+
+        .. note::
+
+            Worker processes inherit the wordlist from the main process, thus the `fork` start
+            method must be available (i.e. `jobs` cannot be used on Windows). Features are
+            re-created in the workers from their JSON specification (see `Feature.to_json`), thus
+            feature functions must be importable.
+
+        :param wl: :class:`cltoolkit.Wordlist` instance.
+        :param languages: Iterable of languages or language IDs, or `None` to select all \
+        languages of the wordlist.
+        :param jobs: Number of worker processes.
+        :param threads: Number of threads.
+        :param cache: :class:`cltoolkit.features.cache.ResultCache` instance. If passed, only \
+        values not found in the cache are computed - and then added to the cache.
+        :return: Generator of pairs (language ID, values as returned by \
+        `FeatureCollection.values`), yielded as soon as results are available.
+        """
+        lids = [getattr(lg, 'id', lg) for lg in (wl.languages if languages is None else languages)]
+        if cache is None:
+            for res in self._iter_values(wl, [(lid, None) for lid in lids], jobs, threads):
+                yield res
+            return
+
+        feature_keys = [(f.id, cache.feature_key(f, ts=wl.ts)) for f in self]
+        keys, cached, tasks = {}, {}, []
+        for lid in lids:
+            keys[lid] = collections.OrderedDict(
+                (fid, cache.key(fkey, wl.languages[lid])) for fid, fkey in feature_keys)
+            cached[lid] = cache.get(keys[lid].values())
+            missing = [fid for fid, key in keys[lid].items() if key not in cached[lid]]
+            if missing:
+                tasks.append((lid, missing))
+            else:
+                yield lid, collections.OrderedDict(
+                    (fid, cached[lid][key]) for fid, key in keys[lid].items())
+
+        for lid, values in self._iter_values(wl, tasks, jobs, threads):
+            cache.set({keys[lid][fid]: value for fid, value in values.items()})
+            yield lid, collections.OrderedDict(
+                (fid, values[fid] if fid in values else cached[lid][key])
+                for fid, key in keys[lid].items())
+        cache.evict()
+
+    def _iter_values(self, wl, tasks, jobs, threads):
+        """
+        :param tasks: `list` of pairs (language ID, list of feature IDs or `None`).
+        """
+        if jobs:
+            # With the `fork` start method, the arguments of the initializer are inherited by the
+            # worker processes rather than pickled.
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=jobs,
+                    mp_context=multiprocessing.get_context('fork'),
+                    initializer=_init_worker,
+                    initargs=(wl, [f.to_json() for f in self])) as executor:
+                # Languages are submitted one by one, so results are yielded per language.
+                futures = [executor.submit(_values, lid, fids) for lid, fids in tasks]
+                for future in concurrent.futures.as_completed(futures):
+                    yield future.result()
+        elif threads:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+                futures = {
+                    executor.submit(self.values, wl.languages[lid], features=fids): lid
+                    for lid, fids in tasks}
+                for future in concurrent.futures.as_completed(futures):
+                    yield futures[future], future.result()
+        else:
+            for lid, fids in tasks:
+                yield lid, self.values(wl.languages[lid], features=fids)
+
+    def compute(self, wl, languages=None, jobs=None, threads=None, cache=None) -> FeatureMatrix:
+        """
+        Compute the values of all features for languages of a wordlist.
+
+        .. seealso:: :meth:`FeatureCollection.iter_values`
+
+        :return: :class:`cltoolkit.features.matrix.FeatureMatrix` instance with rows in the order \
+        of `languages`.
+        """
+        lids = [getattr(lg, 'id', lg) for lg in (wl.languages if languages is None else languages)]
+        res = FeatureMatrix(self, lids)
+        for lid, values in self.iter_values(
+                wl, languages=lids, jobs=jobs, threads=threads, cache=cache):
+            res.set_row(lid, values)
+        return res
+
+
+@attr.s
+class _Worker:
+    wordlist = attr.ib()
+    features = attr.ib()
+
+    def values(self, lid, fids):
+        return lid, self.features.values(self.wordlist.languages[lid], features=fids)
+
+
+def _init_worker(wl, specs):
+    global _WORKER
+    _WORKER = _Worker(wl, FeatureCollection(Feature(**spec) for spec in specs))
+
+
+def _values(lid, fids):
+    return _WORKER.values(lid, fids)
@@ -0,0 +1,64 @@
+"""
+Intermediate results shared between features.
+
+Many features compute the same intermediate results for a language, e.g. the consonants in the
+sound inventory or the syllable structure of the forms. Feature callables can declare the names of
+the intermediates they use in an attribute `intermediates`. When computing features with
+:meth:`cltoolkit.features.FeatureCollection.values`, one :class:`Intermediates` object is passed to
+all these features as keyword argument `intermediates`, such that each intermediate is computed
+only once per language.
+
+Names of intermediates are
+
+- the names registered with :func:`register`,
+- dotted names `<intermediate>.<attribute>`, e.g. `inventory.consonants` for the consonants of the
+  sound inventory.
+"""
+import collections
+
+from .phonology import syllable_complexity
+
+__all__ = ['Intermediates', 'register', 'REGISTRY']
+
+#: Maps names of intermediates to callables computing the intermediate for a language.
+REGISTRY = collections.OrderedDict()
+
+
+def register(name):
+    """
+    Decorator to register a callable, accepting a language as sole argument, as intermediate.
+    """
+    def decorator(func):
+        REGISTRY[name] = func
+        return func
+    return decorator
+
+
+@register('inventory')
+def inventory(language):
+    return language.sound_inventory
+
+
+@register('syllable_complexity')
+def syllables(language):
+    return syllable_complexity(language.forms_with_sounds)
+
+
+class Intermediates(dict):
+    """
+    A `dict` of intermediates for a language, computing intermediates when first accessed.
+    """
+    def __init__(self, language):
+        dict.__init__(self)
+        self.language = language
+
+    def __missing__(self, name):
+        if name in REGISTRY:
+            value = REGISTRY[name](self.language)
+        elif '.' in name:
+            base, _, attribute = name.rpartition('.')
+            value = getattr(self[base], attribute)
+        else:
+            raise KeyError(name)
+        self[name] = value
+        return value
@@ -36,15 +36,21 @@ class ConceptComparison(util.FeatureFunction):
     def run(self, aforms, bforms, abforms):
         raise NotImplementedError()  # pragma: no cover
 
+    def forms(self, language):
+        """
+        Collect the forms for the concepts in `alist`, `blist` and `ablist`.
+
+        :return: Triple of `frozenset` s of form strings.
+        """
+        index = language.concept_forms
+        return tuple(
+            index.get(xlist[0], frozenset()) if len(xlist) == 1
+            else frozenset().union(*[index.get(x, ()) for x in xlist])
+            for xlist in [self.alist, self.blist, self.ablist])
+
     @requires(concepts)
     def __call__(self, language):
-        aforms, bforms, abforms = [], [], []
-        for xlist, xforms in zip([self.alist, self.blist, self.ablist], [aforms, bforms, abforms]):
-            for x in xlist:
-                if x in language.concepts:
-                    for form in language.concepts[x].forms:
-                        xforms += [form.form]
-        return self.run(aforms, bforms, abforms)
+        return self.run(*self.forms(language))
 
 
 class Colexification(ConceptComparison):
@@ -62,7 +68,7 @@ class Colexification(ConceptComparison):
 
     def run(self, aforms, bforms, abforms):
         if aforms and bforms:
-            return any(f in bforms for f in aforms)
+            return not frozenset(aforms).isdisjoint(bforms)
         if abforms:
             return True
 
@@ -71,6 +77,11 @@ class PartialColexification(ConceptComparison):
     """
     Computes if two concepts are partially colexified, i.e. if a form for the first concept is
     contained in a form for the second concept.
+
+    .. note:
+
+        Only forms for the first concept with more than two characters and forms for the second
+        concept with more than five characters are considered.
     """
     def __init__(self, *args, **kw):
         ConceptComparison.__init__(self, *args, **kw)
@@ -80,19 +91,22 @@ class PartialColexification(ConceptComparison):
         })
 
     def run(self, aforms, bforms, abforms):
-        for aform, bform in product(aforms, bforms):
-            if bform.startswith(aform) and len(aform) > 2 and len(bform) > 5:
-                return True
-            if bform.endswith(aform) and len(aform) > 2 and len(bform) > 5:
-                return True
         if aforms and bforms:
-            return False
+            # `str.startswith` and `str.endswith` accept a tuple of affixes to check at once.
+            affixes = tuple(aform for aform in aforms if len(aform) > 2)
+            return bool(affixes) and any(
+                bform.startswith(affixes) or bform.endswith(affixes)
+                for bform in bforms if len(bform) > 5)
 
 
 class SharedSubstring(ConceptComparison):
     """
     Computes if forms for the two concepts share a substring (of length >= 3).
 
+    More precisely, checks whether a form for the second concept contains a part of length >= 3
+    of a form for the first concept, when split into two non-empty parts. A form for the second
+    concept which is identical to the first part of the split does not count.
+
     .. note:
 
         The substring is computed based on the from value, i.e. using whatever transcription
@@ -106,13 +120,21 @@ class SharedSubstring(ConceptComparison):
         })
 
     def run(self, aforms, bforms, abforms):
-        for aform, bform in product(aforms, bforms):
-            for i in range(1, len(aform) - 1):
-                morphA = aform[:i]
-                morphB = aform[i:]
-                if len(morphA) >= 3 and morphA in bform and bform != morphA:
-                    return True
-                if len(morphB) >= 3 and morphB in bform and bform != morphA:
-                    return True
         if aforms and bforms:
-            return False
+            return any(self.shares_substring(aform, bform)
+                       for aform, bform in product(aforms, bforms))
+
+    @staticmethod
+    def shares_substring(aform, bform) -> bool:
+        # If a part of `aform` is not contained in `bform`, no longer part is. Thus, it is
+        # enough to check the shortest prefix, and suffixes - starting with the shortest - until
+        # one is not contained.
+        n = len(aform)
+        if n >= 5 and bform != aform[:3] and aform[:3] in bform:
+            return True
+        for i in range(n - 3, 0, -1):
+            if aform[i:] not in bform:
+                break
+            if bform != aform[:i]:
+                return True
+        return False
@@ -0,0 +1,248 @@
+"""
+Compact storage of feature values computed for many languages.
+
+A :class:`FeatureMatrix` stores the values of a set of features for a set of languages as typed
+arrays, one per feature:
+
+- values of categorical features (i.e. features with `categories`) are coded as integers, i.e. as
+  positions in the list of category keys,
+- values of features of type `bool`, `int` and `float` are stored natively,
+- missing values (`None` or a `MissingRequirement`) are recorded in a separate mask.
+
+.. code-block:: python
+
+    >>> m = FEATURES.compute(wl)
+    >>> value = m['carvalhopurus-Apurina', 'HasRoundedVowels']
+    >>> labels = m.labels('HasRoundedVowels')
+"""
+import sys
+import json
+import array
+import struct
+import pathlib
+import collections
+
+import attr
+
+__all__ = ['FeatureMatrix', 'Column']
+
+MAGIC = b'CLTKFM1\n'
+TYPECODES = collections.OrderedDict([
+    ('category', 'h'), ('bool', 'b'), ('int', 'q'), ('float', 'd')])
+
+
+def kind(feature):
+    if feature.categories:
+        return 'category'
+    name = getattr(feature.type, '__name__', feature.type)
+    return name if name in TYPECODES else 'category'
+
+
+@attr.s
+class Column:
+    """
+    The values of one feature for all languages of a :class:`FeatureMatrix`.
+
+    :ivar kind: One of `category`, `bool`, `int`, `float`.
+    :ivar levels: `list` of category keys for categorical features. For categorical features \
+    without explicit categories, the levels are the distinct values in order of appearance.
+    :ivar labels: `dict` mapping category keys to labels.
+    :ivar values: `array.array` of values (or codes, i.e. positions in `levels`).
+    :ivar mask: `bytearray` marking missing values with 1.
+    """
+    id = attr.ib()
+    kind = attr.ib()
+    levels = attr.ib(default=None)
+    labels = attr.ib(default=None)
+    values = attr.ib(default=None, repr=False)
+    mask = attr.ib(default=None, repr=False)
+
+    @classmethod
+    def from_feature(cls, feature, size):
+        k = kind(feature)
+        categories = feature.categories or {}
+        return cls(
+            id=feature.id,
+            kind=k,
+            levels=[key for key in categories if key is not None] if k == 'category' else None,
+            labels=collections.OrderedDict(categories) if categories else None,
+            values=array.array(TYPECODES[k], [0] * size),
+            mask=bytearray([1] * size))
+
+    def encode(self, value):
+        if self.kind == 'category':
+            try:
+                return self.levels.index(value)
+            except ValueError:
+                if self.labels:
+                    raise ValueError('Invalid value for feature {}: {}'.format(self.id, value))
+                self.levels.append(value)
+                return len(self.levels) - 1
+        return {'bool': bool, 'int': int, 'float': float}[self.kind](value)
+
+    def decode(self, i):
+        if self.mask[i]:
+            return None
+        if self.kind == 'category':
+            return self.levels[self.values[i]]
+        return bool(self.values[i]) if self.kind == 'bool' else self.values[i]
+
+    def __setitem__(self, i, value):
+        if value is None or isinstance(value, Exception):
+            self.values[i], self.mask[i] = 0, 1
+        else:
+            self.values[i], self.mask[i] = self.encode(value), 0
+
+    def __getitem__(self, i):
+        return self.decode(i)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        return (self.decode(i) for i in range(len(self)))
+
+
+class FeatureMatrix:
+    """
+    A matrix of feature values, with languages as rows and features as columns.
+
+    :param features: Iterable of :class:`cltoolkit.features.Feature` instances.
+    :param languages: Iterable of language IDs.
+    """
+    def __init__(self, features, languages):
+        self.languages = list(languages)
+        self._rows = {lid: i for i, lid in enumerate(self.languages)}
+        if len(self._rows) != len(self.languages):
+            raise ValueError('Duplicate language IDs')
+        self.columns = collections.OrderedDict()
+        for feature in features:
+            if isinstance(feature, Column):
+                self.columns[feature.id] = feature
+            else:
+                self.columns[feature.id] = Column.from_feature(feature, len(self.languages))
+
+    @classmethod
+    def from_values(cls, features, values):
+        """
+        :param values: `dict` mapping language IDs to `dict` s mapping feature IDs to values, e.g. \
+        as yielded by :meth:`cltoolkit.features.FeatureCollection.iter_values`.
+        """
+        res = cls(features, values.keys())
+        for lid, row in values.items():
+            res.set_row(lid, row)
+        return res
+
+    @property
+    def features(self):
+        return list(self.columns)
+
+    @property
+    def shape(self):
+        return len(self.languages), len(self.columns)
+
+    def __contains__(self, lid):
+        return lid in self._rows
+
+    def __getitem__(self, item):
+        lid, fid = item
+        return self.columns[fid][self._rows[lid]]
+
+    def __setitem__(self, item, value):
+        lid, fid = item
+        self.columns[fid][self._rows[lid]] = value
+
+    def set_row(self, lid, values):
+        """
+        :param values: `dict` mapping feature IDs to values.
+        """
+        row = self._rows[lid]
+        for fid, value in values.items():
+            self.columns[fid][row] = value
+
+    def row(self, lid) -> collections.OrderedDict:
+        row = self._rows[lid]
+        return collections.OrderedDict((fid, col[row]) for fid, col in self.columns.items())
+
+    def column(self, fid) -> list:
+        """
+        The values of a feature for all languages (in the order of `FeatureMatrix.languages`).
+        """
+        return list(self.columns[fid])
+
+    def labels(self, fid) -> list:
+        """
+        The category labels of the values of a feature for all languages.
+        """
+        col = self.columns[fid]
+        return [(col.labels or {}).get(v, v) for v in col]
+
+    def is_missing(self, lid, fid) -> bool:
+        return bool(self.columns[fid].mask[self._rows[lid]])
+
+    def select(self, languages=None, features=None):
+        """
+        Slice the matrix.
+
+        :param languages: Iterable of language IDs or `None` to select all languages.
+        :param features: Iterable of feature IDs or `None` to select all features.
+        :return: New `FeatureMatrix` instance.
+        """
+        columns = [self.columns[fid] for fid in (self.columns if features is None else features)]
+        languages = self.languages if languages is None else list(languages)
+        rows = [self._rows[lid] for lid in languages]
+        return self.__class__([attr.evolve(
+            col,
+            levels=list(col.levels) if col.levels is not None else None,
+            values=array.array(col.values.typecode, (col.values[i] for i in rows)),
+            mask=bytearray(col.mask[i] for i in rows)) for col in columns], languages)
+
+    def to_values(self) -> collections.OrderedDict:
+        return collections.OrderedDict((lid, self.row(lid)) for lid in self.languages)
+
+    def save(self, path):
+        """
+        Save the matrix in a binary format, i.e. a JSON header followed by the arrays.
+        """
+        header = collections.OrderedDict([
+            ('byteorder', sys.byteorder),
+            ('languages', self.languages),
+            ('columns', [
+                collections.OrderedDict([
+                    ('id', col.id),
+                    ('kind', col.kind),
+                    ('levels', col.levels),
+                    ('labels', list(col.labels.items()) if col.labels else None),
+                ]) for col in self.columns.values()]),
+        ])
+        header = json.dumps(header).encode('utf8')
+        with pathlib.Path(path).open('wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<Q', len(header)))
+            f.write(header)
+            for col in self.columns.values():
+                f.write(col.values.tobytes())
+                f.write(bytes(col.mask))
+
+    @classmethod
+    def load(cls, path):
+        with pathlib.Path(path).open('rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError('Invalid feature matrix file: {}'.format(path))
+            header = json.loads(f.read(struct.unpack('<Q', f.read(8))[0]).decode('utf8'))
+            size, columns = len(header['languages']), []
+            for spec in header['columns']:
+                values = array.array(TYPECODES[spec['kind']])
+                values.frombytes(f.read(size * values.itemsize))
+                if header['byteorder'] != sys.byteorder:
+                    values.byteswap()  # pragma: no cover
+                columns.append(Column(
+                    id=spec['id'],
+                    kind=spec['kind'],
+                    levels=spec['levels'],
+                    # Labels are stored as list of pairs, to keep non-string keys intact.
+                    labels=collections.OrderedDict(
+                        (k, v) for k, v in spec['labels']) if spec['labels'] else None,
+                    values=values,
+                    mask=bytearray(f.read(size))))
+        return cls(columns, header['languages'])
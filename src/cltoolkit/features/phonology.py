@@ -4,7 +4,7 @@ import textwrap
 import collections
 import typing
 
-from cltoolkit.util import iter_syllables
+from cltoolkit.util import iter_syllables, FEATURE_BITS
 from .reqs import requires, inventory, graphemes, inventory_with_occurrences
 from . import util
 
@@ -13,6 +13,8 @@ class WithInventory(util.FeatureFunction):
     """
     Base class for feature callables requiring access to a phoneme inventory.
     """
+    intermediates = ['inventory']
+
     def __init__(self, *args, **kw):
         super().__init__(*args, **kw)
 
@@ -20,8 +22,27 @@ class WithInventory(util.FeatureFunction):
         raise NotImplementedError()  # pragma: no cover
 
     @requires(inventory)
-    def __call__(self, language):
-        return self.run(language.sound_inventory)
+    def __call__(self, language, intermediates=None):
+        return self.run(
+            language.sound_inventory if intermediates is None else intermediates['inventory'])
+
+
+class WithSoundTags(WithInventory):
+    """
+    Base class for inventory features which only depend on the set of "tags" assigned to the
+    individual sounds of an inventory.
+
+    Since tags can be computed for the sounds of a wordlist once, such features can be computed
+    for all languages at once (see :mod:`cltoolkit.features.vectorized`).
+    """
+    def sound_tags(self, sound) -> typing.Iterable:
+        raise NotImplementedError()  # pragma: no cover
+
+    def decide(self, tags: set):
+        raise NotImplementedError()  # pragma: no cover
+
+    def run(self, inv):
+        return self.decide({tag for sound in inv for tag in self.sound_tags(sound)})
 
 
 class InventoryQuery(WithInventory):
@@ -103,6 +124,7 @@ class StartsWithSound(util.FeatureFunction):
         super().__init__(concepts, features, concept_label=concept_label, sound_label=sound_label)
         self.concepts = concepts
         self.features = features
+        self.specs = FEATURE_BITS.compile(features)
         concept_label = util.concept_label(concepts, label=concept_label)
         sound_label = sound_label or str(self.features)
         self.rtype = bool
@@ -121,7 +143,7 @@ class StartsWithSound(util.FeatureFunction):
             if concept in language.concepts:
                 for form in language.concepts[concept].forms:
                     has_forms = True
-                    if sound_match(form.sound_objects[0], self.features):
+                    if sound_match(form.sound_objects[0], self.specs):
                         return True
         return False if has_forms else None
 
@@ -136,11 +158,16 @@ def sound_match(sound, features):
         some sounds by defining them in terms of a part of their features alone.
         E.g., [m] and its variants can be defined as ["bilabial", "nasal"], since
         we do not care about the rest of the features.
+
+    :param features: List of lists of feature values or compiled specifications (see \
+    :meth:`cltoolkit.util.FeatureBits.compile`).
     """
-    for feature in features:
-        if not set(feature).difference(sound.featureset):
-            return True
-    return False
+    mask = getattr(sound, 'feature_mask', None)
+    if mask is None:
+        mask = FEATURE_BITS.mask(sound.featureset)
+    if not all(isinstance(spec, int) for spec in features):
+        features = FEATURE_BITS.compile(features)
+    return FEATURE_BITS.matches(mask, features)
 
 
 # vowel_sound_size = BaseInventoryQuery("vowel_sounds")
@@ -195,7 +222,7 @@ def is_lateral(sound):
     return sound.airstream == "lateral"
 
 
-class PlosiveFricativeVoicing(WithInventory):
+class PlosiveFricativeVoicing(WithSoundTags):
     """
     .. seealso:: `WALS 4A - Voicing in Plosives and Fricatives <https://wals.info/feature/4A>`_
     """
@@ -206,11 +233,12 @@ class PlosiveFricativeVoicing(WithInventory):
         4: "in both plosives and fricatives"
     }
 
-    def run(self, inv):
-        voiced = {
-            sound.manner for sound in inv.consonants if
-            sound.manner in ['stop', 'fricative'] and is_voiced(sound)  # noqa: W504
-        }
+    def sound_tags(self, sound):
+        if sound.type == 'consonant' and sound.manner in ['stop', 'fricative'] and \
+                is_voiced(sound):
+            yield sound.manner
+
+    def decide(self, voiced):
         if not voiced:
             return 1
         if len(voiced) == 2:
@@ -221,7 +249,7 @@ class PlosiveFricativeVoicing(WithInventory):
             return 3
 
 
-class HasPtk(WithInventory):
+class HasPtk(WithSoundTags):
     """
     .. seealso:: `WALS 5A - Voicing and Gaps in Plosive Systems <https://wals.info/feature/5A>`_
     """
@@ -234,22 +262,23 @@ class HasPtk(WithInventory):
         5: "has at least 6 values of [p t t̪ k b d d̪ g]"
     }
 
-    def run(self, inv):
-        sounds = [sound.obj.s for sound in inv.consonants]
+    def sound_tags(self, sound):
+        if sound.type == 'consonant' and sound.obj.s in ['p', 't', 't̪', 'k', 'b', 'd', 'g', 'd̪']:
+            yield sound.obj.s
 
+    def decide(self, sounds):
         if 'p' not in sounds and 'g' not in sounds:
             return 1
         if 'g' not in sounds:
             return 2
         if 'p' not in sounds:
             return 3
-        if len(set([x for x in sounds
-                    if x in ['p', 't', 't̪', 'k', 'b', 'd', 'g', 'd̪']])) >= 6:
+        if len(sounds) >= 6:
             return 5
         return 4
 
 
-class HasUvular(WithInventory):
+class HasUvular(WithSoundTags):
     """
     .. seealso:: `WALS 6A - Uvular Consonants <https://wals.info/feature/6A>`_
     """
@@ -260,8 +289,11 @@ class HasUvular(WithInventory):
         4: "has uvulars"
     }
 
-    def run(self, inv):
-        uvulars = set([sound.manner for sound in inv.consonants if is_uvular(sound)])
+    def sound_tags(self, sound):
+        if sound.type == 'consonant' and is_uvular(sound):
+            yield sound.manner
+
+    def decide(self, uvulars):
         if len(uvulars) == 0:
             return 1
         if len(uvulars) == 1:
@@ -271,7 +303,7 @@ class HasUvular(WithInventory):
         return 4
 
 
-class HasGlottalized(WithInventory):
+class HasGlottalized(WithSoundTags):
     """
     .. seealso:: `WALS 7A - Glottalized Consonants <https://wals.info/feature/7A>`_
     """
@@ -286,12 +318,16 @@ class HasGlottalized(WithInventory):
         8: "has implosvies, ejective resonants, and ejective stops"
     }
 
-    def run(self, inv):
-        ejectives = [
-            sound for sound in inv.consonants if is_ejective(sound) and stop_like(sound)]
-        resonants = [
-            sound for sound in inv.consonants if is_ejective(sound) and not stop_like(sound)]
-        implosives = [sound for sound in inv.consonants if is_implosive(sound)]
+    def sound_tags(self, sound):
+        if sound.type == 'consonant':
+            if is_ejective(sound):
+                yield 'ejective' if stop_like(sound) else 'resonant'
+            if is_implosive(sound):
+                yield 'implosive'
+
+    def decide(self, tags):
+        ejectives, resonants, implosives = [
+            t in tags for t in ['ejective', 'resonant', 'implosive']]
 
         if not ejectives and not implosives and not resonants:
             return 1
@@ -310,7 +346,7 @@ class HasGlottalized(WithInventory):
         return 8
 
 
-class HasLaterals(WithInventory):
+class HasLaterals(WithSoundTags):
     """
     .. seealso:: `WALS 8A - Lateral Consonants <https://wals.info/feature/8A>`_
     """
@@ -323,17 +359,24 @@ class HasLaterals(WithInventory):
         6: "has laterals, but no stops and no [l]"
     }
 
-    def run(self, inv):
-        laterals = set([sound.obj.manner for sound in inv.consonants if is_lateral(sound)])
+    def sound_tags(self, sound):
+        if sound.type == 'consonant' and is_lateral(sound):
+            yield ('lateral', sound.obj.manner)
+        if sound.id == 'l':
+            yield 'l'
+
+    def decide(self, tags):
+        laterals = {t[1] for t in tags if isinstance(t, tuple)}
+        has_l = 'l' in tags
         if not laterals:
             return 1
-        if len(laterals) == 1 and 'l' in inv.sounds:
+        if len(laterals) == 1 and has_l:
             return 2
-        if "affricate" not in laterals and 'stop' not in laterals and 'l' not in inv.sounds:
+        if "affricate" not in laterals and 'stop' not in laterals and not has_l:
             return 3
-        if ('stop' in laterals or "affricate" in laterals) and 'l' in inv.sounds:
+        if ('stop' in laterals or "affricate" in laterals) and has_l:
             return 4
-        if ('stop' in laterals or "affricate" in laterals) and 'l' not in inv.sounds:
+        if ('stop' in laterals or "affricate" in laterals) and not has_l:
             return 5
         return 6
 
@@ -348,9 +391,11 @@ class HasEngma(util.FeatureFunction):
         3: "velar nasal is missing"
     }
 
+    intermediates = ['inventory']
+
     @requires(inventory_with_occurrences)
-    def __call__(self, language):
-        inv = language.sound_inventory
+    def __call__(self, language, intermediates=None):
+        inv = language.sound_inventory if intermediates is None else intermediates['inventory']
         consonants = [sound.obj.s for sound in inv.consonants]
         if 'ŋ' in consonants:
             for pos, fid in inv.sounds['ŋ'].occurrences:
@@ -372,6 +417,7 @@ class HasSoundsWithFeature(WithInventory):
         super().__init__(attr, features)
         self.attr = attr
         self.features = features
+        self.specs = FEATURE_BITS.compile(features)
         self.rtype = bool
         sound_spec = '{} {}'.format('  or '.join(' '.join(f) for f in self.features), self.attr)
         self.doc = textwrap.dedent(self.__doc__.format(sound_spec)).strip()
@@ -381,14 +427,12 @@ class HasSoundsWithFeature(WithInventory):
         }
 
     def run(self, inv):
-        for sound in getattr(inv, self.attr):
-            for featureset in self.features:
-                if not set(featureset).difference(sound.featureset):
-                    return True
-        return False
+        return any(
+            FEATURE_BITS.matches(sound.feature_mask, self.specs)
+            for sound in getattr(inv, self.attr))
 
 
-class HasRoundedVowels(WithInventory):
+class HasRoundedVowels(WithSoundTags):
     """
     .. seealso:: `WALS 11A - Front Rounded Vowels <https://wals.info/feature/11A>`_
     """
@@ -400,13 +444,15 @@ class HasRoundedVowels(WithInventory):
     }
     doc = "WALS Feature 11A, check for front rounded vowels."
 
-    def run(self, inv):
-        high = [
-            sound for sound in inv.vowels if
-            sound.obj.roundedness == 'rounded' and sound.obj.centrality in ['front', 'near-front']]
-        mid = [
-            sound for sound in inv.vowels if
-            sound.obj.roundedness == 'rounded' and sound.obj.centrality in ['central']]
+    def sound_tags(self, sound):
+        if sound.type == 'vowel' and sound.obj.roundedness == 'rounded':
+            if sound.obj.centrality in ['front', 'near-front']:
+                yield 'high'
+            if sound.obj.centrality in ['central']:
+                yield 'mid'
+
+    def decide(self, tags):
+        high, mid = 'high' in tags, 'mid' in tags
         if not high and not mid:
             return 1
         if high and mid:
@@ -463,12 +509,16 @@ def syllable_complexity(forms_with_sounds):
 
 
 class WithSyllableComplexity(util.FeatureFunction):
+    intermediates = ['syllable_complexity']
+
     def run(self, preceding, following):
         raise NotImplementedError()  # pragma: no cover
 
     @requires(graphemes)
-    def __call__(self, language):
-        return self.run(*syllable_complexity(language.forms_with_sounds))
+    def __call__(self, language, intermediates=None):
+        return self.run(*(
+            syllable_complexity(language.forms_with_sounds) if intermediates is None
+            else intermediates['syllable_complexity']))
 
 
 class SyllableStructure(WithSyllableComplexity):
@@ -557,7 +607,7 @@ class SyllableOffset(WithSyllableComplexity):
         return 4
 
 
-class LacksCommonConsonants(WithInventory):
+class LacksCommonConsonants(WithSoundTags):
     """
     .. seealso:: `WALS 18A - Absence of Common Consonants <https://wals.info/feature/18A>`_
     """
@@ -570,13 +620,14 @@ class LacksCommonConsonants(WithInventory):
         6: "all other cases"
     }
 
-    def run(self, inv):
-        bilabials = [
-            sound for sound in inv.consonants if 'bilabial' in sound.obj.featureset]
-        fricatives = [
-            sound for sound in inv.consonants if 'fricative' in sound.obj.featureset]
-        nasals = [
-            sound for sound in inv.consonants if 'nasal' in sound.obj.featureset]
+    def sound_tags(self, sound):
+        if sound.type == 'consonant':
+            for tag in ['bilabial', 'fricative', 'nasal']:
+                if tag in sound.obj.featureset:
+                    yield tag
+
+    def decide(self, tags):
+        bilabials, fricatives, nasals = [t in tags for t in ['bilabial', 'fricative', 'nasal']]
         if bilabials and fricatives and nasals:
             return 1
         if not bilabials and fricatives and nasals:
@@ -590,7 +641,7 @@ class LacksCommonConsonants(WithInventory):
         return 6
 
 
-class HasUncommonConsonants(WithInventory):
+class HasUncommonConsonants(WithSoundTags):
     """
     .. seealso:: `WALS 19A - Presence of Uncommon Consonants <https://wals.info/feature/19A>`_
     """
@@ -604,18 +655,22 @@ class HasUncommonConsonants(WithInventory):
         7: "clicks"
     }
 
-    def run(self, inv):
-        clicks = [sound for sound in inv.consonants if sound.obj.manner == "click"]
-        labiovelars = [
-            sound for sound in inv.consonants if sound.obj.labialization ==  # noqa: W504
-            "labialized" and sound.obj.place in ["velar", "uvular"]]
-        dentalfrics = [
-            sound for sound in inv.consonants if sound.obj.place == "dental"
-            and not sound.obj.airstream == "sibilant" and sound.obj.manner == "fricative"]
-        pharyngeals = [
-            sound for sound in inv.consonants if
-            sound.obj.place == "pharyngeal" or  # noqa: W504
-            sound.obj.pharyngealization == "pharyngealized"]
+    def sound_tags(self, sound):
+        if sound.type != 'consonant':
+            return
+        if sound.obj.manner == "click":
+            yield 'click'
+        if sound.obj.labialization == "labialized" and sound.obj.place in ["velar", "uvular"]:
+            yield 'labiovelar'
+        if sound.obj.place == "dental" and not sound.obj.airstream == "sibilant" \
+                and sound.obj.manner == "fricative":
+            yield 'dentalfric'
+        if sound.obj.place == "pharyngeal" or sound.obj.pharyngealization == "pharyngealized":
+            yield 'pharyngeal'
+
+    def decide(self, tags):
+        clicks, labiovelars, dentalfrics, pharyngeals = [
+            t in tags for t in ['click', 'labiovelar', 'dentalfric', 'pharyngeal']]
         if not clicks and not dentalfrics and not labiovelars and not pharyngeals:
             return 1
         if clicks and pharyngeals and dentalfrics:
@@ -5,12 +5,15 @@ computation. These requirements can be expressed (and enforced) by decorating th
 the appropriate callables from the `cltoolkit.features.reqs` module - or any other callable
 accepting a :class:`cltoolkit.models.Language` instance as argument, returning `True` if the
 requirement is met.
+
+Languages in a wordlist provide the requirements defined in this module they meet as
+precomputed :attr:`cltoolkit.models.Language.capabilities`, thus checking these is cheap.
 """
 import logging
 import functools
 
 __all__ = ['MissingRequirement', 'inventory', 'graphemes', 'concepts', 'requires',
-           'inventory_with_occurrences']
+           'inventory_with_occurrences', 'is_met', 'eligible']
 
 
 class MissingRequirement(ValueError):
@@ -57,6 +60,34 @@ def concepts(language):
         return False
 
 
+#: Requirements which may be looked up in the `capabilities` of a language.
+CAPABILITIES = {
+    inventory: 'inventory',
+    inventory_with_occurrences: 'inventory_with_occurrences',
+    graphemes: 'graphemes',
+    concepts: 'concepts',
+}
+
+
+def is_met(requirement, language) -> bool:
+    """
+    Check whether a language meets a requirement - using the language's capabilities if possible.
+    """
+    capabilities = getattr(language, 'capabilities', None)
+    if capabilities is not None and requirement in CAPABILITIES:
+        return CAPABILITIES[requirement] in capabilities
+    return bool(requirement(language))
+
+
+def eligible(feature, language) -> bool:
+    """
+    Check whether a language meets the requirements declared for a feature.
+
+    :param feature: :class:`cltoolkit.features.Feature` instance.
+    """
+    return all(is_met(req, language) for req in feature.requires or [] if callable(req))
+
+
 def requires(*what):
     """
     Decorator to specify requirements of a feature callable.
@@ -71,13 +102,13 @@ def requires(*what):
         func.requires = what
 
         @functools.wraps(func)
-        def wrapper_requires(*args):
+        def wrapper_requires(*args, **kw):
             language = args[-1]
-            status = [(req.__name__, req(language)) for req in what]
+            status = [(req.__name__, is_met(req, language)) for req in what]
             if not all([s[1] for s in status]):
                 raise MissingRequirement(' '.join(s[0] for s in status if not s[1]))
             try:
-                return func(*args)
+                return func(*args, **kw)
             except:  # noqa: E722
                 log = logging.getLogger('cltoolkit')
                 log.debug('dataset: {}; language: {}'.format(
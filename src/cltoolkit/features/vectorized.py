@@ -0,0 +1,157 @@
+"""
+Vectorized computation of inventory features.
+
+Instead of computing inventory features language by language from :class:`cltoolkit.models.Sound`
+objects, the sound inventories of all languages of a wordlist are represented as an
+:class:`IncidenceMatrix` - with rows of the matrix stored as bitsets over the sounds of the
+wordlist. Properties of sounds (types, CLTS feature values, tags assigned by features) are
+computed once per sound of the wordlist, and represented as bitsets as well. Thus, features can be
+computed as bitwise reductions of the rows.
+
+The following feature functions are supported:
+
+- :class:`cltoolkit.features.phonology.InventoryQuery`,
+  :class:`cltoolkit.features.phonology.YesNoQuery`,
+  :class:`cltoolkit.features.phonology.Ratio` and
+  :class:`cltoolkit.features.phonology.HasSoundsWithFeature`, if they query sub-inventories
+  selected by sound type (e.g. `consonants`, but not `consonants_by_quality`),
+- subclasses of :class:`cltoolkit.features.phonology.WithSoundTags`.
+
+All other features are computed with the regular, scalar code.
+
+.. code-block:: python
+
+    >>> from cltoolkit.features import vectorized
+    >>> matrix = vectorized.compute(FEATURES, wl)
+"""
+import collections
+
+from cltoolkit.models import Inventory, GetSubInventoryByType
+from .phonology import WithSoundTags, InventoryQuery, YesNoQuery, Ratio, HasSoundsWithFeature
+from .matrix import FeatureMatrix
+
+__all__ = ['IncidenceMatrix', 'compile_feature', 'compute']
+
+
+def popcount(i):
+    return bin(i).count('1')
+
+
+def sub_inventory_types(attr):
+    """
+    The sound types selected for a sub-inventory or `None`, if the sub-inventory is not selected
+    by type alone.
+    """
+    descriptor = Inventory.__dict__.get(attr)
+    if type(descriptor) is GetSubInventoryByType:
+        return descriptor.types
+
+
+class IncidenceMatrix:
+    """
+    A language × sound incidence matrix for a wordlist.
+
+    :ivar sounds: `DictTuple` of sounds of the wordlist.
+    :ivar rows: `OrderedDict` mapping language IDs to bitsets (i.e. `int` s) where bit `i` is set \
+    if the sound at position `i` in `sounds` is in the inventory of the language.
+    """
+    def __init__(self, wl, languages=None):
+        self.sounds = wl.sounds
+        self.rows = collections.OrderedDict(
+            (getattr(lg, 'id', lg), 0)
+            for lg in (wl.languages if languages is None else languages))
+        for pos, sound in enumerate(self.sounds):
+            for lid in sound.occurrences:
+                if lid in self.rows:
+                    self.rows[lid] |= 1 << pos
+        self._masks = {}
+
+    @property
+    def languages(self):
+        return list(self.rows)
+
+    def mask(self, key, predicate) -> int:
+        """
+        Bitset of the sounds for which `predicate` is true (cached under `key`).
+        """
+        if key not in self._masks:
+            mask = 0
+            for pos, sound in enumerate(self.sounds):
+                if predicate(sound):
+                    mask |= 1 << pos
+            self._masks[key] = mask
+        return self._masks[key]
+
+    def type_mask(self, types) -> int:
+        return self.mask(('type', tuple(types)), lambda s: s.type in types)
+
+    def feature_mask(self, values) -> int:
+        """
+        Bitset of the sounds with all CLTS feature values in `values`.
+        """
+        return self.sounds.mask(values)
+
+    def tag_masks(self, func) -> collections.OrderedDict:
+        """
+        Bitsets of sounds per tag, with tags assigned to sounds by `func`.
+        """
+        res = collections.OrderedDict()
+        for pos, sound in enumerate(self.sounds):
+            for tag in func(sound):
+                res[tag] = res.get(tag, 0) | 1 << pos
+        return res
+
+
+def compile_feature(func, matrix):
+    """
+    Compile a feature function into a callable computing the feature value from a row of the
+    incidence matrix.
+
+    :return: callable or `None`, if the feature function is not supported.
+    """
+    if isinstance(func, WithSoundTags) and type(func).run is WithSoundTags.run:
+        masks = matrix.tag_masks(func.sound_tags)
+        return lambda row: func.decide({tag for tag, mask in masks.items() if row & mask})
+    if type(func) in (InventoryQuery, YesNoQuery, HasSoundsWithFeature):
+        types = sub_inventory_types(func.attr)
+        if types is None:
+            return None
+        mask = matrix.type_mask(types)
+        if type(func) is InventoryQuery:
+            return lambda row: popcount(row & mask)
+        if type(func) is HasSoundsWithFeature:
+            fmask = 0
+            for values in func.features:
+                fmask |= matrix.feature_mask(values)
+            mask &= fmask
+        return lambda row: bool(row & mask)
+    if type(func) is Ratio:
+        types1, types2 = sub_inventory_types(func.attr1), sub_inventory_types(func.attr2)
+        if types1 is None or types2 is None:
+            return None
+        mask1, mask2 = matrix.type_mask(types1), matrix.type_mask(types2)
+        return lambda row: popcount(row & mask1) / popcount(row & mask2)
+    return None
+
+
+def compute(features, wl, languages=None) -> FeatureMatrix:
+    """
+    Compute the values of a :class:`cltoolkit.features.FeatureCollection` for languages of a
+    wordlist, using vectorized computation where possible.
+
+    :return: :class:`cltoolkit.features.matrix.FeatureMatrix` instance.
+    """
+    matrix = IncidenceMatrix(wl, languages=languages)
+    res, scalar = FeatureMatrix(features, matrix.languages), []
+    for feature in features:
+        compiled = compile_feature(feature.function, matrix)
+        if compiled is None:
+            scalar.append(feature.id)
+            continue
+        for lid, row in matrix.rows.items():
+            # Languages without sounds do not meet the `inventory` requirement.
+            res[lid, feature.id] = compiled(row) if row else None
+    if scalar:
+        for lid in matrix.languages:
+            res.set_row(lid, features.values(wl.languages[lid], features=scalar))
+    return res
@@ -0,0 +1,145 @@
+"""
+Approximate nearest-neighbour search for sound inventories.
+
+Comparing the inventory of a language to the inventories of all other languages in a large sample
+with :meth:`cltoolkit.models.Inventory.strict_similarity` is costly. A :class:`MinHashIndex`
+computes MinHash signatures for the sets of sounds of the inventories and distributes the
+languages over buckets using "banding" (i.e. locality sensitive hashing), such that only languages
+sharing at least one bucket with the query language must be compared.
+
+.. code-block:: python
+
+    >>> index = MinHashIndex(wl.languages, aspect='consonants')
+    >>> for language, similarity in index.query(wl.languages[0], k=20, exact=True):
+    ...     print(language.id, similarity)
+"""
+import random
+import hashlib
+import collections
+
+from cltoolkit.util import DictTuple
+
+__all__ = ['MinHashIndex']
+
+#: Mersenne prime used as modulus of the hash functions.
+PRIME = (1 << 61) - 1
+
+
+def base_hash(grapheme):
+    """
+    Stable (i.e. not randomized per process) hash of a grapheme.
+    """
+    return int.from_bytes(
+        hashlib.blake2b(grapheme.encode('utf8'), digest_size=8).digest(), 'big') % PRIME
+
+
+class MinHashIndex:
+    """
+    An index of languages, keyed by MinHash signatures of an aspect of their sound inventories.
+
+    :param languages: Iterable of :class:`cltoolkit.models.Language` objects.
+    :param aspect: Name of the (sub-)inventory to index, e.g. `"sounds"` or `"consonants"`.
+    :param num_perm: Number of hash functions, i.e. length of the signatures.
+    :param bands: Number of bands the signatures are divided in. More bands make it more likely \
+    that less similar inventories end up as candidates for a query.
+    :param seed: Seed for the random parameters of the hash functions.
+    """
+    def __init__(self, languages=None, aspect='sounds', num_perm=128, bands=32, seed=42):
+        if num_perm % bands:
+            raise ValueError('num_perm must be a multiple of bands')
+        self.aspect = aspect
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rnd = random.Random(seed)
+        self._permutations = [
+            (rnd.randrange(1, PRIME), rnd.randrange(0, PRIME)) for _ in range(num_perm)]
+        self._buckets = [collections.defaultdict(list) for _ in range(bands)]
+        # Maps language IDs to pairs (language, signature).
+        self._languages = collections.OrderedDict()
+        for language in languages or []:
+            self.add(language)
+
+    def __len__(self):
+        return len(self._languages)
+
+    def __contains__(self, language):
+        return getattr(language, 'id', language) in self._languages
+
+    @property
+    def languages(self):
+        return DictTuple(lg for lg, _ in self._languages.values())
+
+    def sounds(self, language):
+        """
+        The set of sounds of the indexed aspect of a language's inventory.
+        """
+        return {sound.grapheme for sound in getattr(language.sound_inventory, self.aspect)}
+
+    def signature(self, sounds):
+        """
+        Compute the MinHash signature of a set of sounds.
+
+        :return: `tuple` of `num_perm` integers or `None`, if the set is empty.
+        """
+        if not sounds:
+            return None
+        hashes = [base_hash(s) for s in sounds]
+        return tuple(min((a * h + b) % PRIME for h in hashes) for a, b in self._permutations)
+
+    def _bands(self, signature):
+        for i in range(self.bands):
+            yield self._buckets[i], signature[i * self.rows:(i + 1) * self.rows]
+
+    def add(self, language):
+        """
+        Add a language to the index.
+
+        Languages with empty (sub-)inventories are indexed, but will never be returned as result
+        of a query.
+        """
+        if language.id in self._languages:
+            raise ValueError('Duplicate language ID: {}'.format(language.id))
+        signature = self.signature(self.sounds(language))
+        self._languages[language.id] = (language, signature)
+        if signature:
+            for buckets, band in self._bands(signature):
+                buckets[band].append(language.id)
+
+    def candidates(self, language):
+        """
+        Languages sharing at least one bucket with `language`.
+        """
+        signature = self._languages[language.id][1] if language.id in self._languages \
+            else self.signature(self.sounds(language))
+        res = collections.OrderedDict()
+        if signature:
+            for buckets, band in self._bands(signature):
+                for lid in buckets.get(band, []):
+                    if lid != language.id and lid not in res:
+                        res[lid] = self._languages[lid]
+        return signature, res
+
+    def query(self, language, k=10, exact=False):
+        """
+        Approximate the `k` languages with the most similar inventories.
+
+        :param language: :class:`cltoolkit.models.Language` to search similar languages for.
+        :param k: Maximal number of results.
+        :param exact: If `True`, similarities of candidates are computed with \
+        :meth:`cltoolkit.models.Inventory.strict_similarity`, otherwise they are estimated from \
+        the signatures.
+        :return: `list` of pairs (language, similarity), sorted by descending similarity. Since \
+        only candidates sharing a bucket with `language` are considered, fewer than `k` \
+        results may be returned.
+        """
+        signature, candidates = self.candidates(language)
+        res = []
+        for lg, sig in candidates.values():
+            if exact:
+                sim = language.sound_inventory.strict_similarity(
+                    lg.sound_inventory, aspects=[self.aspect])
+            else:
+                sim = sum(1 for i, j in zip(signature, sig) if i == j) / self.num_perm
+            res.append((lg, sim))
+        return sorted(res, key=lambda i: -i[1])[:k]
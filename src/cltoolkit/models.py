@@ -2,25 +2,37 @@
 Basic models.
 """
 import typing
+import threading
 import statistics
 import collections
 
 import attr
 import lingpy
-from clldutils.misc import lazyproperty as cached_property
 import pyclts
 from pyclts.models import Sound as CLTSSound, Symbol, Cluster, Consonant
 
-from cltoolkit.util import NestedAttribute, DictTuple, jaccard, MutatedDataValue
+from cltoolkit.cache import cached_property, lazyproperty
+from cltoolkit.util import (
+    NestedAttribute, DictTuple, jaccard, MutatedDataValue, fingerprint, combine_fingerprints,
+    ts_version, weak, sonority, FEATURE_BITS, clear_reference_errors,
+)
 
 
 @attr.s(repr=False)
 class CLCore:
     """
     Base class to represent data in a wordlist.
+
+    .. note::
+
+        References from data objects to the wordlist - and to other "parent" objects, like the
+        language of a form - are weak references (see :func:`cltoolkit.util.weak`). Thus, the
+        objects of a wordlist are freed as soon as the wordlist is no longer referenced - and
+        computing derived data (e.g. `language.sound_inventory`) raises a
+        :class:`cltoolkit.util.WordlistReleasedError` after that.
     """
     id = attr.ib()
-    wordlist = attr.ib(default=None)
+    wordlist = attr.ib(default=None, converter=weak)
     data = attr.ib(default=None)
 
     def __repr__(self):
@@ -42,6 +54,69 @@ class WithForms:
     def forms_with_graphemes(self):
         return DictTuple([f for f in self.forms if f.graphemes])
 
+    @cached_property
+    def fingerprint(self):
+        """
+        Fingerprint of the forms, including their IDs (see :attr:`Form.fingerprint`).
+        """
+        return self._fingerprint('fingerprint')
+
+    @cached_property
+    def content_fingerprint(self):
+        """
+        Fingerprint of the content of the forms (see :attr:`Form.content_fingerprint`).
+        """
+        return self._fingerprint('content_fingerprint')
+
+    def _fingerprint(self, attribute):
+        return fingerprint(
+            ts_version(getattr(getattr(self, 'wordlist', None), 'ts', None)),
+            combine_fingerprints(getattr(f, attribute) for f in self.forms))
+
+
+class WithCapabilities:
+    """
+    Mixin to represent data in a wordlist which can be described with features.
+    """
+    @cached_property
+    def capabilities(self):
+        """
+        `frozenset` of the names of the requirements (see :mod:`cltoolkit.features.reqs`) met by
+        the data, or `None` if the object does not belong to a wordlist.
+
+        .. note::
+
+            Since sounds are recorded for all forms with sounds, the sound inventory is available
+            (with occurrences) if there are such forms. Thus, the inventory must not be computed
+            to check the requirement.
+        """
+        if self.wordlist is None:
+            return None
+        res = set()
+        if self.forms_with_sounds:
+            res.update(['inventory', 'inventory_with_occurrences'])
+        if self.forms_with_graphemes:
+            res.add('graphemes')
+        if self.concepts:
+            res.add('concepts')
+        return frozenset(res)
+
+
+class WithConcepts:
+    """
+    Mixin to represent data in a wordlist with concepts.
+    """
+    @cached_property
+    def concept_forms(self):
+        """
+        `dict` mapping concept IDs to the `frozenset` of form strings (i.e. `Form.form`) for the
+        concept - an index to compare forms for concepts efficiently, e.g. when computing
+        colexifications.
+        """
+        return {
+            concept.id: frozenset(form.form for form in concept.forms)
+            for concept in self.concepts}
+
 
 @attr.s
 class WithDataset:
@@ -53,7 +128,7 @@ class WithDataset:
 
 
 @attr.s(repr=False)
-class Language(CLCore, WithForms, WithDataset):
+class Language(CLCore, WithForms, WithDataset, WithCapabilities, WithConcepts):
     """
     Base class for handling languages.
 
@@ -80,10 +155,73 @@ class Language(CLCore, WithForms, WithDataset):
         sounds = []
         for sound in self.wordlist.sounds:
             if self.id in sound.occurrences:
-                sounds.append(Sound.from_sound(sound, language=self))
+                sounds.append(LanguageSound(sound, self))
         return Inventory(language=self, ts=self.wordlist.ts, sounds=DictTuple(sounds))
 
 
+@attr.s(repr=False)
+class Languoid(CLCore, WithForms, WithCapabilities, WithConcepts):
+    """
+    A languoid, i.e. all languages of a wordlist with the same Glottocode - typically varieties
+    from different datasets.
+
+    :ivar languages: `DictTuple` of :class:`Language` instances.
+    :ivar glottocode: `str`, Glottocode of the languoid.
+
+    .. note::
+
+        Attributes from the `data` of the languages, like `family`, are taken from the first
+        language.
+    """
+    languages = attr.ib(default=None)
+    macroarea = MutatedDataValue("Macroarea")
+    family = MutatedDataValue("Family")
+    subgroup = MutatedDataValue("SubGroup")
+
+    @classmethod
+    def from_languages(cls, glottocode, languages, wordlist=None):
+        return cls(
+            id=glottocode,
+            wordlist=wordlist,
+            data=languages[0].data,
+            languages=DictTuple(languages),
+            forms=DictTuple(f for lg in languages for f in lg.forms))
+
+    @property
+    def glottocode(self):
+        return self.id
+
+    @cached_property
+    def senses(self):
+        return DictTuple(s for lg in self.languages for s in lg.senses)
+
+    @cached_property
+    def concepts(self):
+        concepts = collections.OrderedDict()
+        for lg in self.languages:
+            for concept in lg.concepts:
+                concepts.setdefault(concept.id, []).append(concept)
+        return DictTuple(
+            items[0] if len(items) == 1 else Concept.from_concept(
+                items[0],
+                forms=DictTuple(f for c in items for f in c.forms),
+                senses=DictTuple(s for c in items for s in c.senses))
+            for items in concepts.values())
+
+    @cached_property
+    def sound_inventory(self):
+        """
+        The union of the sound inventories of the languages.
+        """
+        sounds, positions = self.wordlist.sounds, set()
+        for lg in self.languages:
+            positions.update(sounds.position(sound.id) for sound in lg.sound_inventory)
+        return Inventory(
+            language=self,
+            ts=self.wordlist.ts,
+            sounds=DictTuple(LanguoidSound(sounds[i], self) for i in sorted(positions)))
+
+
 @attr.s(repr=False, eq=False)
 class Sense(CLCore, WithForms, WithDataset):
     """
@@ -97,7 +235,7 @@ class Sense(CLCore, WithForms, WithDataset):
         Unlike senses in a wordlist, which are dataset-specific, concepts in a wordlist are defined
         for all datasets.
     """
-    language = attr.ib(default=None)
+    language = attr.ib(default=None, converter=weak)
     name = MutatedDataValue("Name")
 
     def __repr__(self):
@@ -154,7 +292,8 @@ class Concept(CLCore, WithForms):
             concepticon_id=concept.data.get("Concepticon_ID", ""),
             concepticon_gloss=concept.data.get("Concepticon_Gloss", ""),
             forms=forms,
-            senses=senses
+            senses=senses,
+            wordlist=concept.wordlist,
         )
 
     @classmethod
@@ -166,6 +305,7 @@ class Concept(CLCore, WithForms):
             concepticon_gloss=concept.concepticon_gloss,
             senses=senses,
             forms=forms,
+            wordlist=concept.wordlist,
         )
 
     def __repr__(self):
@@ -182,25 +322,62 @@ class Form(CLCore, WithDataset):
     :ivar sense: The meaning expressed by the form.
     :ivar sounds: The segmented strings defined by the B(road) IPA.
     :ivar graphemes: The segmented graphemes (possibly not BIPA conform).
+    :ivar sound_ids: Positions of the sounds of the form in `wordlist.sounds`.
+    :ivar grapheme_ids: Positions of the graphemes of the form in `wordlist.graphemes`.
     """
-    concept = attr.ib(default=None, repr=False)
-    language = attr.ib(default=None, repr=False)
-    sense = attr.ib(default=None, repr=False)
+    concept = attr.ib(default=None, repr=False, converter=weak)
+    language = attr.ib(default=None, repr=False, converter=weak)
+    sense = attr.ib(default=None, repr=False, converter=weak)
     #: Sounds (graphemes recognized in the specified transcription system) in the segmented form:
     sounds = attr.ib(default=attr.Factory(list), repr=False)
     value = MutatedDataValue("Value")
     form = MutatedDataValue("Form")
-    #: Graphemes in the segmented form:
-    graphemes = MutatedDataValue("Segments", transform=lingpy.basictypes.lists)
     cognates = attr.ib(default=attr.Factory(dict), repr=False)
+    sound_ids = attr.ib(default=None, repr=False)
+    grapheme_ids = attr.ib(default=None, repr=False)
+
+    # Note: Values computed for single forms are small, thus we store them with the form rather
+    # than in the cache manager of the wordlist.
+    @lazyproperty
+    def graphemes(self):
+        """
+        Graphemes in the segmented form.
+        """
+        return lingpy.basictypes.lists(self.data.get("Segments", None))
+
+    @lazyproperty
+    def fingerprint(self):
+        """
+        Fingerprint of ID and content of the form.
+        """
+        return fingerprint(self.id, self.content_fingerprint)
+
+    @lazyproperty
+    def content_fingerprint(self):
+        """
+        Fingerprint of the concept, form and segments of the form.
+        """
+        return fingerprint(
+            self.concept.id if self.concept else None,
+            self.form,
+            ' '.join(self.data.get("Segments") or []))
 
     @property
+    @clear_reference_errors
     def sound_objects(self):
-        return [self.wordlist.sounds[str(self.wordlist.ts[t])] for t in self.sounds]
+        if self.sound_ids is None:
+            self.sound_ids = tuple(
+                self.wordlist.sounds.position(str(self.wordlist.ts[t])) for t in self.sounds)
+        return [self.wordlist.sounds[i] for i in self.sound_ids]
 
     @property
+    @clear_reference_errors
     def grapheme_objects(self):
-        return [self.wordlist.graphemes[self.dataset + '-' + s] for s in self.graphemes or []]
+        if self.grapheme_ids is None:
+            self.grapheme_ids = tuple(
+                self.wordlist.graphemes.position(self.dataset + '-' + s)
+                for s in self.graphemes or [])
+        return [self.wordlist.graphemes[i] for i in self.grapheme_ids]
 
     def __repr__(self):
         return "<" + self.__class__.__name__ + " " + self.form + ">"
@@ -208,7 +385,7 @@ class Form(CLCore, WithDataset):
 
 @attr.s(repr=False)
 class Cognate(CLCore, WithDataset):
-    form = attr.ib(default=None, repr=False)
+    form = attr.ib(default=None, repr=False, converter=weak)
     contribution = attr.ib(default=None, repr=False)
 
 
@@ -258,13 +435,27 @@ class Sound(CLCore, WithForms):
         return self.grapheme
 
     def __eq__(self, other):
-        if isinstance(other, self.__class__):
+        if isinstance(other, (Sound, LanguageSound)):
             return self.grapheme == other.grapheme
         return False
 
     def __repr__(self):
         return "<" + self.__class__.__name__ + " " + self.grapheme + ">"
 
+    @lazyproperty
+    def feature_mask(self):
+        """
+        The featureset of the sound as bitmask (see :class:`cltoolkit.util.FeatureBits`).
+        """
+        return FEATURE_BITS.mask(self.featureset)
+
+    @lazyproperty
+    def sonority(self):
+        """
+        The sonority class of the sound, as used for syllabification.
+        """
+        return sonority(self.grapheme)
+
     def similarity(self, other):
         if self.type not in ["marker", "unknownsound"] and \
                 other.type not in ["marker", "unknownsound"]:
@@ -275,18 +466,6 @@ class Sound(CLCore, WithForms):
             return 0
         return 0
 
-    @classmethod
-    def from_sound(cls, sound, language):
-        return cls(
-            id=str(sound),
-            language=language,
-            data=sound.data,
-            obj=sound.obj,
-            wordlist=sound.wordlist,
-            grapheme=sound.grapheme,
-            occurrences=sound.occurrences[language.id],
-        )
-
     def consonant_or_cluster_attr(self, attribute):
         if isinstance(self.obj, Consonant):
             return getattr(self.obj, attribute)
@@ -311,22 +490,148 @@ class Sound(CLCore, WithForms):
         return self.consonant_or_cluster_attr('airstream')
 
 
+class Sounds(DictTuple):
+    """
+    A `DictTuple` of :class:`Sound` objects, which can be queried by features.
+
+    .. code-block:: python
+
+        >>> [str(s) for s in wl.sounds.where(["bilabial", "nasal"])]
+        ['m', 'm̥']
+    """
+    def __init__(self, items, **kw):
+        DictTuple.__init__(self, items, **kw)
+        self._feature_index = None
+        self._lock = threading.Lock()
+
+    def mask(self, values) -> int:
+        """
+        Bitset of the positions of the sounds with all feature values in `values`.
+        """
+        with self._lock:
+            if self._feature_index is None:
+                # Maps feature values to the bitsets of positions of the sounds with the value.
+                self._feature_index = collections.defaultdict(int)
+                for pos, sound in enumerate(self):
+                    for value in sound.featureset:
+                        self._feature_index[value] |= 1 << pos
+        res = (1 << len(self)) - 1
+        for value in values:
+            res &= self._feature_index.get(value, 0)
+        return res
+
+    def where(self, features) -> DictTuple:
+        """
+        The sounds matching a feature specification.
+
+        :param features: `list` of feature values or `list` of such lists, to match sounds \
+        matching any of the alternative specifications.
+        :raises ValueError: If no - or an empty - specification is passed, since it would match \
+        all sounds.
+        """
+        specs = [features] if all(isinstance(f, str) for f in features) else features
+        if not all(specs):
+            raise ValueError('Empty feature specification: {}'.format(features))
+        res, positions = 0, []
+        for spec in specs:
+            res |= self.mask(spec)
+        while res:
+            lowest = res & -res
+            positions.append(lowest.bit_length() - 1)
+            res ^= lowest
+        return DictTuple(tuple.__getitem__(self, pos) for pos in positions)
+
+
+class LanguageSound:
+    """
+    A lightweight view of a :class:`Sound` in the context of one language.
+
+    All attributes are looked up on the shared `Sound` object of the wordlist, except for
+    `language` and the language-specific `occurrences` and `forms`.
+
+    .. note::
+
+        Sound inventories of languages in a wordlist are made up of `LanguageSound` objects,
+        thus the memory needed for inventories does not depend on the number of occurrences.
+    """
+    __slots__ = ('sound', 'language')
+
+    def __init__(self, sound, language):
+        self.sound = sound
+        self.language = language
+
+    def __getattr__(self, name):
+        # Special attributes are not delegated - and neither is anything before `sound` is set,
+        # e.g. when the object is re-created by `copy` or `pickle`.
+        if name.startswith('__') or name == 'sound':
+            raise AttributeError(name)
+        return getattr(self.sound, name)
+
+    @property
+    def occurrences(self):
+        return self.sound.occurrences[self.language.id]
+
+    @property
+    def forms(self):
+        return DictTuple(collections.OrderedDict(
+            (form.id, form) for _, form in self.occurrences).values())
+
+    def __len__(self):
+        return len(self.occurrences)
+
+    def __str__(self):
+        return self.sound.grapheme
+
+    def __eq__(self, other):
+        return self.sound.__eq__(other)
+
+    def __repr__(self):
+        return "<" + self.__class__.__name__ + " " + self.sound.grapheme + ">"
+
+
+class LanguoidSound(LanguageSound):
+    """
+    A view of a :class:`Sound` in the context of a :class:`Languoid`.
+    """
+    __slots__ = ()
+
+    @property
+    def occurrences(self):
+        return [
+            occ for lg in self.language.languages
+            for occ in self.sound.occurrences.get(lg.id, [])]
+
+
 class GetSubInventoryByType:
+    """
+    Descriptor for sub-inventories of an :class:`Inventory`, computed once per inventory.
+    """
     def __init__(self, types):
-        def select_sounds(inventory):
-            return DictTuple([v for v in inventory if v.type in types])
-        self.select_sounds = select_sounds
+        self.types = types
 
-    def __get__(self, obj, objtype=None):
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def select_sounds(self, sounds):
+        return DictTuple([v for v in sounds if v.type in self.types])
+
+    def sub_inventory(self, obj):
         return self.select_sounds(obj.sounds)
 
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        # Since the descriptor does not define `__set__`, the stored value takes precedence on
+        # subsequent attribute lookups.
+        return obj.__dict__.setdefault(self.name, self.sub_inventory(obj))
+
 
 class GetSubInventoryByProperty(GetSubInventoryByType):
     def __init__(self, types, properties):
         GetSubInventoryByType.__init__(self, types)
         self.properties = properties
 
-    def __get__(self, obj, objtype=None):
+    def sub_inventory(self, obj):
         out = []
         sounds = self.select_sounds(obj.sounds)
         sound_set = set([sound.grapheme for sound in sounds])
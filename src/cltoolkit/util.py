@@ -1,17 +1,28 @@
 """
 Utility functions for lexicore.
 """
+import array
+import bisect
+import copyreg
+import hashlib
 import pathlib
+import weakref
+import threading
+import operator
 import functools
+import collections
 
-from lingpy.sequence.sound_classes import syllabify
+from lingpy.settings import rcParams
+from lingpy.sequence.sound_classes import syllabify, token2class
 from lingpy.basictypes import lists
+import pyclts
 from pycldf import Dataset
-from pycldf.util import DictTuple as BaseDictTuple
 
 __all__ = [
-    'valid_sounds', 'identity', 'jaccard', 'iter_syllables',
-    'DictTuple', 'NestedAttribute', 'MutatedDataValue', 'MutatedNestedDictValue']
+    'valid_sounds', 'identity', 'jaccard', 'iter_syllables', 'syllabify_tokens',
+    'sonority', 'syllable_spans', 'FeatureBits', 'FEATURE_BITS', 'fingerprint',
+    'combine_fingerprints', 'weak', 'WordlistReleasedError',
+    'DictTuple', 'Groups', 'NestedAttribute', 'MutatedDataValue', 'MutatedNestedDictValue']
 
 
 def valid_sounds(sounds):
@@ -40,6 +51,110 @@ def valid_sounds(sounds):
     return lists(out)
 
 
+def fingerprint(*components):
+    """
+    Compute a 128-bit fingerprint for a sequence of components (converted to `str`).
+
+    :return: Fingerprint as hex string.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for c in components:
+        h.update(('' if c is None else str(c)).encode('utf8') + b'\x00')
+    return h.hexdigest()
+
+
+def combine_fingerprints(fingerprints):
+    """
+    Combine fingerprints, independent of their order.
+
+    .. note::
+
+        Since fingerprints are combined by addition (modulo 2^128), a combined fingerprint can be
+        updated incrementally, by adding (or subtracting) the fingerprints of added (or removed)
+        items.
+    """
+    return '{:032x}'.format(sum(int(fp, 16) for fp in fingerprints) % 2 ** 128)
+
+
+_TS_VERSIONS = weakref.WeakKeyDictionary()
+
+
+def ts_version(ts):
+    """
+    Version identifier for a transcription system, used to compute fingerprints.
+
+    Since the resolution of sounds depends on the data of the transcription system (e.g. of a
+    CLTS release) - rather than on the version of `pyclts` only - the identifier includes a
+    fingerprint of the sounds, diacritics and normalizations of the transcription system.
+    """
+    if ts is None:
+        return ''
+    try:
+        return _TS_VERSIONS[ts]
+    except (KeyError, TypeError):
+        pass
+    rows = ['sound\t{}\t{}'.format(g, s.name) for g, s in getattr(ts, 'sounds', {}).items()]
+    rows.extend(
+        'diacritic\t{}\t{}\t{}'.format(type_, g, value)
+        for type_, diacritics in getattr(ts, 'diacritics', {}).items()
+        for g, value in diacritics.items())
+    rows.extend(
+        'normalize\t{}\t{}'.format(*item) for item in getattr(ts, '_normalize', {}).items())
+    res = '{} {} {}'.format(
+        getattr(ts, 'id', ''), pyclts.__version__, fingerprint(*sorted(rows)))
+    try:
+        _TS_VERSIONS[ts] = res
+    except TypeError:  # `ts` cannot be weakly referenced.
+        pass
+    return res
+
+
+def weak(obj):
+    """
+    Return a weak reference proxy for `obj`.
+
+    Used to reference "parent" objects (e.g. the wordlist or the language of a form) from data
+    objects, thus avoiding reference cycles, which could only be freed by the garbage collector.
+
+    .. note::
+
+        Since the attributes are proxies, they compare equal to the referenced objects, but are
+        not identical, i.e. use `form.language == language` rather than `form.language is
+        language`.
+    """
+    if obj is None or isinstance(obj, weakref.ProxyTypes):
+        return obj
+    return weakref.proxy(obj)
+
+
+class WordlistReleasedError(ReferenceError):
+    """
+    Raised when data objects are used after their wordlist has been released.
+    """
+    def __init__(self):
+        ReferenceError.__init__(
+            self,
+            'The wordlist this object belongs to no longer exists. Data objects reference their '
+            'wordlist only weakly, thus you must keep a reference to the Wordlist while using its '
+            'objects, e.g. `wl = Wordlist(...)` and then `for lg in wl.languages: ...`.')
+
+
+def clear_reference_errors(func):
+    """
+    Decorator turning errors from accessing released weak references into
+    :class:`WordlistReleasedError`.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kw):
+        try:
+            return func(*args, **kw)
+        except WordlistReleasedError:
+            raise
+        except ReferenceError as e:
+            raise WordlistReleasedError() from e
+    return wrapper
+
+
 def identity(x):
     """
     Identity function used as a default for passing functions.
@@ -55,13 +170,88 @@ def jaccard(a, b):
     return i / u if u else 0
 
 
+@functools.lru_cache(maxsize=2 ** 16)
+def syllabify_tokens(tokens):
+    """
+    Syllabify a sequence of tokens.
+
+    Since identical token sequences are frequent across forms and languages, results are cached
+    (use `syllabify_tokens.cache_info()` to inspect the cache).
+
+    :param tokens: `tuple` of tokens.
+    :return: `tuple` of syllables, each a `tuple` of tokens.
+    """
+    return tuple(tuple(syllable) for syllable in syllabify(list(tokens), output='nested'))
+
+
+@functools.lru_cache(maxsize=None)
+def sonority(token) -> int:
+    """
+    The sonority class of a token, i.e. its class in lingpy's `art` sound class model.
+    """
+    return int(token2class(
+        token, 'art', stress=rcParams['stress'], diacritics=rcParams['diacritics'], cldf=False))
+
+
+@functools.lru_cache(maxsize=2 ** 16)
+def syllable_spans(profile):
+    """
+    Compute syllable boundaries from the sonority profile of a sequence.
+
+    This re-implements the rules of `lingpy.sequence.sound_classes.syllabify`, but operates on
+    precomputed sonority classes. Since many forms share the same profile, results are cached.
+
+    :param profile: `tuple` of sonority classes (see :func:`sonority`).
+    :return: `tuple` of pairs `(start, end)` of slice indices of the syllables.
+    """
+    spans, start = [], 0
+    profile = (0,) + tuple(profile) + (0,)
+    for i in range(1, len(profile) - 1):
+        p1, p2, p3 = profile[i - 1], profile[i], profile[i + 1]
+        new_syl = False
+        if p1 >= p2 < p3:
+            if p3 == 8 or p3 == 9:
+                pass
+            # Don't break in initial position, unless a vowel is involved:
+            elif p1 != 7 and p2 != 7 and i == 2:
+                pass
+            # Don't break in final position, unless a vowel follows:
+            elif i == len(profile) - 3 and p3 != 7:
+                pass
+            else:
+                new_syl = True
+        # Always break after a tone, but never after an explicit boundary marker.
+        if (new_syl or p1 == 8) and p1 != 9:
+            spans.append((start, i - 1))
+            start = i - 1
+    spans.append((start, len(profile) - 2))
+    return tuple(spans)
+
+
 def iter_syllables(form):
     """
     Return the syllables of a given form with tokens.
+
+    If the sounds of the form are resolved in a wordlist (see `Form.sound_ids`), the sonority
+    profile is assembled from the sonority classes of the sounds (see `Sound.sonority`), which are
+    computed only once per sound of the wordlist.
     """
+    ids, wl = getattr(form, 'sound_ids', None), getattr(form, 'wordlist', None)
+    profile = tuple(wl.sounds[i].sonority for i in ids) \
+        if ids is not None and wl is not None else None
+    start = 0
     for morpheme in form.sounds.n:
-        for syllable in syllabify(morpheme, output='nested'):
-            yield syllable
+        morpheme, end = tuple(morpheme), start + len(morpheme)
+        mprofile = profile[start:end] if profile else tuple(sonority(t) for t in morpheme)
+        start = end + 1
+        if not any(mprofile) or rcParams['gap_symbol'] in morpheme \
+                or rcParams['morpheme_separator'] in morpheme:
+            # Alignments, unknown sounds and spurious separators are handled by lingpy:
+            for syllable in syllabify_tokens(morpheme):
+                yield syllable
+            continue
+        for i, j in syllable_spans(mprofile):
+            yield morpheme[i:j]
 
 
 class NestedAttribute:
@@ -117,11 +307,143 @@ class MutatedNestedDictValue:
 MutatedDataValue = functools.partial(MutatedNestedDictValue, 'data')
 
 
-class DictTuple(BaseDictTuple):
+#: Lock to make the lazy creation of secondary indexes of `DictTuple` s thread-safe.
+_INDEX_LOCK = threading.RLock()
+
+
+class FeatureBits:
+    """
+    Assigns bits to feature values, such that sets of feature values - e.g. the featureset of a
+    sound or a feature specification like `["bilabial", "nasal"]` - can be represented as integer
+    bitmasks. A sound matches a specification, if `mask & spec == spec`.
+
+    Bits are assigned when a value is first seen, thus masks are only valid within one process.
+    """
+    def __init__(self, values=None):
+        self._bits = {}
+        self._lock = threading.Lock()
+        self.update(values or [])
+
+    def __len__(self):
+        return len(self._bits)
+
+    def update(self, values):
+        for value in values:
+            self.bit(value)
+
+    def bit(self, value) -> int:
+        try:
+            return self._bits[value]
+        except KeyError:
+            with self._lock:
+                return self._bits.setdefault(value, 1 << len(self._bits))
+
+    def mask(self, values) -> int:
+        res = 0
+        for value in values:
+            res |= self.bit(value)
+        return res
+
+    def compile(self, specs) -> tuple:
+        """
+        Compile a list of alternative feature specifications into a `tuple` of masks.
+        """
+        return tuple(self.mask(spec) for spec in specs)
+
+    @staticmethod
+    def matches(mask, specs) -> bool:
+        """
+        Check whether a mask matches any of the compiled specifications.
+        """
+        return any(mask & spec == spec for spec in specs)
+
+
+#: The registry of feature bits used for the featuresets of sounds.
+FEATURE_BITS = FeatureBits()
+
+
+class DictTuple(tuple):
     """
     An object allowing access to items of a `tuple` as if it were a `dict` keyed with the `id`
     attribute of the contained objects.
+
+    .. note::
+
+        Rather than in a `dict`, item positions are indexed in an array sorted by the hash of the
+        key, which is searched by bisection. Thus, the index needs only twelve bytes per item
+        (while lookup by key takes logarithmic rather than constant time), and keys must be
+        hashable - but not comparable with each other.
     """
+    def __new__(cls, items, **kw):
+        return super(DictTuple, cls).__new__(cls, tuple(items))
+
+    def __init__(self, items, key=operator.attrgetter('id'), multi=False, indexes=None):
+        """
+        If `key` does not return unique values for all items, you may pass `multi=True` to
+        retrieve `list`s of matching items for `l[key]`.
+
+        Secondary indexes (see :meth:`DictTuple.by`) can be declared by passing a list of keys
+        as `indexes`.
+        """
+        self._key = key
+        self._multi = multi
+        index = sorted((hash(key(o)), i) for i, o in enumerate(tuple.__iter__(self)))
+        self._hashes = array.array('q', [h for h, _ in index])
+        self._index = array.array('I' if len(self) < 2 ** 32 else 'Q', [i for _, i in index])
+        self._indexes = None
+        for index in indexes or []:
+            self.by(index)
+
+    def __reduce__(self):
+        # The index is not pickled, but re-built when unpickling, because hashes of strings differ
+        # between processes.
+        return copyreg.__newobj__, (self.__class__, tuple(self)), \
+            dict(key=self._key, multi=self._multi)
+
+    def __setstate__(self, state):
+        self.__init__(self, **state)
+
+    def by(self, key):
+        """
+        Secondary index, grouping the items by the values of `key`.
+
+        .. code-block:: python
+
+            >>> for family, languages in wl.languages.by('Family').items():
+            ...     print(family, len(languages))
+
+        :param key: Name of an attribute, key in the `data` dict of the items or callable.
+        :return: :class:`Groups` instance, mapping values to `DictTuple` s of items.
+        """
+        with _INDEX_LOCK:
+            if self._indexes is None:
+                self._indexes = {}
+            if key not in self._indexes:
+                getter = key if callable(key) else functools.partial(_attribute_or_data, key)
+                groups = collections.OrderedDict()
+                for o in self:
+                    groups.setdefault(getter(o), []).append(o)
+                self._indexes[key] = Groups(
+                    (k, DictTuple(v, key=self._key, multi=self._multi))
+                    for k, v in groups.items())
+            return self._indexes[key]
+
+    def _positions(self, item):
+        """
+        Yield the positions of the objects with key `item`, in order.
+        """
+        try:
+            h = hash(item)
+        except TypeError:  # Unhashable items cannot be keys.
+            return
+        # Items with equal hashes are sorted by position.
+        lo = bisect.bisect_left(self._hashes, h)
+        while lo < len(self._hashes) and self._hashes[lo] == h:
+            pos = self._index[lo]
+            if self._key(tuple.__getitem__(self, pos)) == item:
+                yield pos
+            lo += 1
+
     def get(self, item, default=None):
         try:
             return self.__getitem__(item)
@@ -130,16 +452,61 @@ class DictTuple(BaseDictTuple):
 
     def __getitem__(self, item):
         if not isinstance(item, (int, slice)):
-            if item not in self._d:
+            positions = list(self._positions(item))
+            if not positions:
                 raise KeyError(item)
+            if self._multi:
+                return [tuple.__getitem__(self, i) for i in positions]
+            return tuple.__getitem__(self, positions[0])
         return super(DictTuple, self).__getitem__(item)
 
     def __contains__(self, item):
-        return getattr(item, 'id', item) in self._d
+        for _ in self._positions(getattr(item, 'id', item)):
+            return True
+        return False
+
+    def position(self, item):
+        """
+        Return the position of the (first) object with key `item` in the tuple.
+        """
+        for pos in self._positions(item):
+            return pos
+        raise KeyError(item)
 
     def items(self):
-        for k, v in self._d.items():
-            yield k, self[v[0]]
+        seen = set()
+        for o in self:
+            k = self._key(o)
+            if k not in seen:
+                seen.add(k)
+                yield k, o
+
+
+def _attribute_or_data(key, o):
+    try:
+        return getattr(o, key)
+    except AttributeError:
+        return (getattr(o, 'data', None) or {}).get(key)
+
+
+class Groups(collections.OrderedDict):
+    """
+    An ordered mapping of values to groups of items, as returned by :meth:`DictTuple.by`.
+    """
+    def apply(self, func, aggregate=list):
+        """
+        Run `func` on all items of each group, aggregating the results per group.
+
+        .. code-block:: python
+
+            >>> wl.languages.by('Family').apply(lambda l: len(l.forms), aggregate=statistics.mean)
+
+        :param func: Callable accepting an item as sole argument.
+        :param aggregate: Callable accepting the `list` of results for a group.
+        :return: `OrderedDict` mapping group values to aggregated results.
+        """
+        return collections.OrderedDict(
+            (k, aggregate([func(o) for o in items])) for k, items in self.items())
 
 
 def datasets_by_id(*ids, path='*/*/cldf/cldf-metadata.json', base_dir="."):
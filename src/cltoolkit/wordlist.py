@@ -1,14 +1,23 @@
 import typing
+import itertools
 import collections
 
+import attr
 import pycldf
 from pyclts import TranscriptionSystem
 import lingpy
 from tqdm import tqdm as progressbar
 
-from cltoolkit.util import identity, lingpy_columns, valid_sounds, DictTuple
+from cltoolkit.util import (
+    identity, lingpy_columns, valid_sounds, DictTuple, fingerprint, combine_fingerprints,
+    ts_version, weak, FEATURE_BITS,
+)
 from cltoolkit import log
-from cltoolkit.models import Language, Concept, Grapheme, Form, Sense, Sound, Cognate
+from cltoolkit.cache import CacheManager, lazyproperty
+from cltoolkit import colexifications as colex
+from cltoolkit.models import (
+    Language, Languoid, Concept, Grapheme, Form, Sense, Sound, Sounds, Cognate,
+)
 
 
 def idjoin(*comps):
@@ -23,6 +32,8 @@ class Wordlist:
     `pycldf.Dataset`.
     :param ts: A TranscriptionSystem (as provided  by pyclts), if you want to
        work with phonological features from CLTS.
+    :param cache: A :class:`cltoolkit.cache.CacheManager` to cache lazily computed attributes of \
+       the data objects, e.g. to limit the memory used by the cache.
     :ivar datasets:
     :ivar languages: :class:`DictTuple`
     :ivar senses: :class:`DictTuple`
@@ -30,15 +41,44 @@ class Wordlist:
     :ivar forms: :class:`DictTuple`
     :ivar Wordlist.graphemes: :class:`DictTuple`
     :ivar sounds: :class:`DictTuple`
+
+    .. note::
+
+        The keys listed in `Wordlist.language_indexes` are indexed when the data is loaded, thus
+        languages can be grouped quickly, e.g. by family, calling `wl.languages.by('Family')`.
+
+    .. warning::
+
+        Data objects reference their wordlist (and other "parent" objects, e.g. the language of a
+        form) only weakly. Thus, a reference to the wordlist must be kept while its objects are
+        used:
+
+        .. code-block:: python
+
+            >>> for lg in Wordlist(datasets, ts=clts.bipa).languages:
+            ...     lg.sound_inventory  # raises cltoolkit.util.WordlistReleasedError
+            >>> wl = Wordlist(datasets, ts=clts.bipa)
+            >>> for lg in wl.languages:
+            ...     lg.sound_inventory  # works
+
+        Parent objects are accessed via weak reference proxies, thus `form.language ==
+        wl.languages[form.language.id]`, but `form.language is not wl.languages[...]`.
     """
+    #: Secondary indexes on `Wordlist.languages` (see :meth:`cltoolkit.util.DictTuple.by`):
+    language_indexes = ['Glottocode', 'Family', 'Macroarea', 'SubGroup', 'dataset']
+
     def __init__(self,
                  datasets: typing.List[pycldf.Dataset],
                  ts: typing.Optional[TranscriptionSystem] = None,
                  concept_id_factory: typing.Callable[[dict], str] =
-                 lambda x: x["Concepticon_Gloss"]):
+                 lambda x: x["Concepticon_Gloss"],
+                 cache: typing.Optional[CacheManager] = None):
         self.datasets = DictTuple(datasets, key=lambda x: x.metadata_dict["rdf:ID"])
         self.ts = ts
+        # Assign bits to all feature values of the transcription system upfront:
+        FEATURE_BITS.update(sorted(getattr(ts, 'feature_system', None) or []))
         self.concept_id_factory = concept_id_factory
+        self.cache = CacheManager() if cache is None else cache
 
         # During data loading, we use flexible, mutable dicts.
         self.languages = collections.OrderedDict()
@@ -60,12 +100,12 @@ class Wordlist:
             self.height, self.width))
 
         # Once the data is loaded, we "freeze" it, making read-only access more flexible.
-        self.languages = DictTuple(self.languages.values())
+        self.languages = DictTuple(self.languages.values(), indexes=self.language_indexes)
         self.concepts = DictTuple(self.concepts.values())
         self.forms = DictTuple(self.forms.values())
         self.senses = DictTuple(self.senses.values())
         self.graphemes = DictTuple(self.graphemes.values())
-        self.sounds = DictTuple(self.sounds.values())
+        self.sounds = Sounds(self.sounds.values())
 
         for lg in self.languages:
             lg.forms = DictTuple(lg.forms.values())
@@ -91,6 +131,120 @@ class Wordlist:
             s.graphemes_in_source = DictTuple(s.graphemes_in_source.values())
             s.forms = DictTuple(s.forms.values())
 
+        if self.ts:
+            for f in self.forms_with_graphemes:
+                self._resolve_tokens(f)
+
+    def _resolve_tokens(self, form):
+        """
+        Store the positions of the graphemes and sounds of a form in the wordlist.
+
+        Since sounds and graphemes are recognized when the form is loaded, this allows
+        `Form.sound_objects` and `Form.grapheme_objects` to be resolved without parsing
+        or transcribing the segments again.
+        """
+        form.grapheme_ids = tuple(
+            self.graphemes.position(idjoin(form.dataset, s)) for s in form.graphemes)
+        if form.sounds and all(s in self.sounds for s in form.sounds):
+            form.sound_ids = tuple(self.sounds.position(s) for s in form.sounds)
+
+    @classmethod
+    def merge(cls, *wordlists):
+        """
+        Merge wordlists without reloading (and re-transcribing) the data.
+
+        Concepts are unified by ID (i.e. the key computed by `concept_id_factory`), sounds by
+        their string representation in the transcription system.
+
+        .. code-block:: python
+
+            >>> wl = Wordlist.merge(Wordlist([ds1], clts.bipa), Wordlist([ds2], clts.bipa))
+
+        .. note::
+
+            The data objects of the merged wordlists are re-used for the new wordlist, i.e. they
+            are bound to the new wordlist. Thus, the merged wordlists should not be used anymore.
+
+        :param wordlists: `Wordlist` instances loaded from disjoint sets of datasets with the same \
+            transcription system.
+        """
+        if any(isinstance(wl, WordlistView) for wl in wordlists):
+            raise ValueError('Views of wordlists cannot be merged')
+        if len(set(getattr(wl.ts, 'id', None) for wl in wordlists)) > 1:
+            raise ValueError('Wordlists with different transcription systems cannot be merged')
+        dsids = [dsid for wl in wordlists for dsid, _ in wl.datasets.items()]
+        if len(set(dsids)) != len(dsids):
+            raise ValueError('Wordlists with shared datasets cannot be merged')
+
+        res = cls.__new__(cls)
+        res.datasets = DictTuple(
+            [ds for wl in wordlists for ds in wl.datasets],
+            key=lambda x: x.metadata_dict["rdf:ID"])
+        res.ts = wordlists[0].ts
+        res.concept_id_factory = wordlists[0].concept_id_factory
+        res.cache = CacheManager(
+            maxsize=wordlists[0].cache.maxsize, maxitems=wordlists[0].cache.maxitems)
+        for wl in wordlists:
+            # Cached values may reference sounds which will be merged.
+            wl.clear_caches()
+
+        concepts, sounds = collections.OrderedDict(), collections.OrderedDict()
+        for wl in wordlists:
+            for concept in wl.concepts:
+                concepts.setdefault(concept.id, []).append(concept)
+            for sound in wl.sounds:
+                sounds.setdefault(sound.id, []).append(sound)
+
+        for cid, items in concepts.items():
+            concepts[cid] = items[0] if len(items) == 1 else Concept.from_concept(
+                items[0],
+                forms=DictTuple(f for c in items for f in c.forms),
+                senses=DictTuple(s for c in items for s in c.senses))
+        for sid, items in sounds.items():
+            sounds[sid] = items[0] if len(items) == 1 else attr.evolve(
+                items[0],
+                occurrences=collections.OrderedDict(
+                    occ for s in items for occ in s.occurrences.items()),
+                graphemes_in_source=DictTuple(g for s in items for g in s.graphemes_in_source),
+                forms=DictTuple(f for s in items for f in s.forms))
+        res.concepts = DictTuple(concepts.values())
+        res.sounds = Sounds(sounds.values())
+
+        for name in ['languages', 'senses', 'forms', 'graphemes', 'cognates']:
+            if name == 'cognates' and not any(hasattr(wl, 'cognates') for wl in wordlists):
+                continue
+            items = [o for wl in wordlists for o in getattr(wl, name, [])]
+            for o in items:
+                o.wordlist = weak(res)
+            setattr(
+                res,
+                name,
+                DictTuple(items, indexes=res.language_indexes if name == 'languages' else None))
+        for s in res.sounds:
+            s.wordlist = weak(res)
+        res.forms_with_sounds = DictTuple(f for wl in wordlists for f in wl.forms_with_sounds)
+        res.forms_with_graphemes = DictTuple(
+            f for wl in wordlists for f in wl.forms_with_graphemes)
+
+        # Finally, we update the references from forms to concepts and sounds.
+        offset = 0
+        for wl in wordlists:
+            sound_positions = [res.sounds.position(s.id) for s in wl.sounds]
+            for f in wl.forms:
+                if f.concept is not None:
+                    f.concept = weak(concepts[f.concept.id])
+                if f.sound_ids is not None:
+                    f.sound_ids = tuple(sound_positions[i] for i in f.sound_ids)
+                if f.grapheme_ids is not None:
+                    f.grapheme_ids = tuple(offset + i for i in f.grapheme_ids)
+            offset += len(wl.graphemes)
+        for concept in res.concepts:
+            concept.wordlist = weak(res)
+        for lg in res.languages:
+            for o in itertools.chain(lg.senses, lg.concepts):
+                o.wordlist = weak(res)
+        return res
+
     def _add_languages(self, dsid, dataset):
         """Append languages to the wordlist.
         """
@@ -212,6 +366,84 @@ class Wordlist:
     def __len__(self):
         return len(self.forms)
 
+    def close(self):
+        """
+        Release the data objects of the wordlist.
+
+        .. note::
+
+            Since data objects reference the wordlist only weakly, the data is also freed when the
+            wordlist goes out of scope, without having to wait for the garbage collector. `close`
+            allows to free the memory explicitly, even if references to the wordlist remain.
+        """
+        self.clear_caches()
+        for name in [
+            'languages', 'concepts', 'forms', 'senses', 'graphemes', 'sounds', 'cognates',
+            'forms_with_sounds', 'forms_with_graphemes', 'languoids',
+        ]:
+            if name in self.__dict__:
+                setattr(self, name, DictTuple([]))
+
+    @lazyproperty
+    def languoids(self):
+        """
+        The languages of the wordlist grouped by Glottocode, as `DictTuple` of \
+        :class:`cltoolkit.models.Languoid` objects. Languages without Glottocode are ignored.
+        """
+        return DictTuple(
+            Languoid.from_languages(glottocode, languages, wordlist=self)
+            for glottocode, languages in self.languages.by('Glottocode').items() if glottocode)
+
+    def clear_caches(self):
+        """
+        Remove all lazily computed attributes of the data objects from the cache.
+        """
+        self.cache.clear()
+
+    @property
+    def fingerprint(self):
+        """
+        Fingerprint of the forms in the wordlist (see :attr:`cltoolkit.models.Form.fingerprint`).
+
+        .. note::
+
+            Fingerprints are cached for each language, so re-computing the fingerprint of a
+            wordlist is cheap.
+        """
+        return fingerprint(
+            ts_version(self.ts), combine_fingerprints(lg.fingerprint for lg in self.languages))
+
+    def dataset_fingerprint(self, dsid):
+        """
+        Fingerprint of the forms of a dataset in the wordlist.
+
+        .. note::
+
+            For datasets without languages in the wordlist, the fingerprint of an empty set of
+            forms is returned.
+        """
+        return fingerprint(
+            ts_version(self.ts),
+            combine_fingerprints(
+                lg.fingerprint for lg in self.languages.by('dataset').get(dsid, ())))
+
+    def view(self, languages=None, concepts=None):
+        """
+        Restrict the wordlist to a selection of languages and/or concepts.
+
+        .. code-block:: python
+
+            >>> swadesh = wl.view(concepts=['HAND', 'WATER', 'EYE'])
+            >>> swadesh.languages[0].sound_inventory  # computed from the selected forms only.
+
+        :param languages: List of language identifiers (or :class:`Language` instances), all \
+            languages if not specified.
+        :param concepts: List of concept identifiers (or :class:`Concept` instances), all \
+            concepts if not specified.
+        :return: :class:`WordlistView` instance.
+        """
+        return WordlistView(self, languages=languages, concepts=concepts)
+
     def load_cognates(self):
         self.cognates = collections.OrderedDict()
         for dsid, dataset in self.datasets.items():
@@ -332,6 +564,29 @@ class Wordlist:
     def length(self):
         return len(self)
 
+    def colexifications(self, min_languages=1) -> list:
+        """
+        Compute the colexification network of the wordlist.
+
+        .. code-block:: python
+
+            >>> from cltoolkit.colexifications import write_edges
+            >>> write_edges(wl.colexifications(min_languages=3), 'colexifications.tsv')
+
+        :param min_languages: Minimal number of languages colexifying two concepts.
+        :return: `list` of :class:`cltoolkit.colexifications.Edge` objects.
+        """
+        return colex.colexifications(self.forms, min_languages=min_languages)
+
+    def partial_colexifications(self, min_languages=1) -> list:
+        """
+        Compute the (directed) partial colexification network of the wordlist.
+
+        :param min_languages: Minimal number of languages partially colexifying two concepts.
+        :return: `list` of :class:`cltoolkit.colexifications.Edge` objects.
+        """
+        return colex.partial_colexifications(self.forms, min_languages=min_languages)
+
     def coverage(self, concepts="concepts", aspect="forms_with_sounds"):
         out = {}
         for language in self.languages:
@@ -340,3 +595,134 @@ class Wordlist:
                 if getattr(concept, aspect):
                     out[language.id] += 1
         return out
+
+
+class WordlistView(Wordlist):
+    """
+    A view on a :class:`Wordlist`, restricted to a selection of languages and/or concepts.
+
+    Forms are shared with the underlying wordlist, while languages, concepts, senses, sounds and
+    graphemes are shallow copies referencing only the forms in the view. All these collections
+    are computed when first accessed, so derived data like sound inventories or coverage is
+    computed (and cached) for the view only.
+
+    :ivar wordlist: The underlying :class:`Wordlist` (or `WordlistView`).
+    """
+    def __init__(self, wordlist, languages=None, concepts=None):
+        self.wordlist = wordlist
+        self.datasets = wordlist.datasets
+        self.ts = wordlist.ts
+        self.concept_id_factory = wordlist.concept_id_factory
+        # Values computed for objects of the view are cached with the view (with the same limits
+        # as for the underlying wordlist), thus they are released together with the view.
+        self.cache = CacheManager(
+            maxsize=wordlist.cache.maxsize, maxitems=wordlist.cache.maxitems)
+        self._language_ids = None if languages is None else {
+            wordlist.languages[getattr(lg, 'id', lg)].id for lg in languages}
+        self._concept_ids = None if concepts is None else {
+            wordlist.concepts[getattr(c, 'id', c)].id for c in concepts}
+
+    def _selected(self, form):
+        if self._language_ids is not None and form.language.id not in self._language_ids:
+            return False
+        if self._concept_ids is not None and \
+                (form.concept is None or form.concept.id not in self._concept_ids):
+            return False
+        return True
+
+    def _occurrences(self, item):
+        """
+        Restrict the occurrences of a sound or grapheme to the forms in the view.
+        """
+        occurrences = collections.OrderedDict()
+        for lid, occs in item.occurrences.items():
+            if self._language_ids is None or lid in self._language_ids:
+                occs = [(i, f) for i, f in occs if self._selected(f)]
+                if occs:
+                    occurrences[lid] = occs
+        return occurrences
+
+    @staticmethod
+    def _forms_in_occurrences(occurrences):
+        return DictTuple(collections.OrderedDict(
+            (f.id, f) for occs in occurrences.values() for _, f in occs).values())
+
+    @lazyproperty
+    def forms(self):
+        return DictTuple(f for f in self.wordlist.forms if self._selected(f))
+
+    @lazyproperty
+    def forms_with_sounds(self):
+        return DictTuple(f for f in self.forms if f.sounds)
+
+    @lazyproperty
+    def forms_with_graphemes(self):
+        return DictTuple(f for f in self.forms if f.graphemes)
+
+    @lazyproperty
+    def languages(self):
+        languages = []
+        for lg in self.wordlist.languages:
+            if self._language_ids is None or lg.id in self._language_ids:
+                language = attr.evolve(
+                    lg, wordlist=self, forms=DictTuple(f for f in lg.forms if self._selected(f)))
+                if self._concept_ids is not None:
+                    language.concepts = DictTuple(
+                        c for c in lg.concepts if c.id in self._concept_ids)
+                    senses = []
+                    for sense in lg.senses:
+                        forms = DictTuple(f for f in sense.forms if self._selected(f))
+                        if forms:
+                            senses.append(Sense.from_sense(sense, language, forms))
+                    language.senses = DictTuple(senses)
+                languages.append(language)
+        return DictTuple(languages, indexes=self.language_indexes)
+
+    @lazyproperty
+    def concepts(self):
+        concepts = []
+        for concept in self.wordlist.concepts:
+            if self._concept_ids is None or concept.id in self._concept_ids:
+                forms = DictTuple(f for f in concept.forms if self._selected(f))
+                if forms or self._language_ids is None:
+                    concepts.append(attr.evolve(
+                        concept,
+                        wordlist=self,
+                        forms=forms,
+                        senses=DictTuple(s for s in concept.senses if s in self.senses)))
+        return DictTuple(concepts)
+
+    @lazyproperty
+    def senses(self):
+        senses = []
+        for sense in self.wordlist.senses:
+            forms = DictTuple(f for f in sense.forms if self._selected(f))
+            if forms:
+                senses.append(attr.evolve(sense, wordlist=self, forms=forms))
+        return DictTuple(senses)
+
+    @lazyproperty
+    def graphemes(self):
+        graphemes = []
+        for grapheme in self.wordlist.graphemes:
+            occurrences = self._occurrences(grapheme)
+            if occurrences:
+                graphemes.append(attr.evolve(
+                    grapheme,
+                    wordlist=self,
+                    occurrences=occurrences,
+                    forms=self._forms_in_occurrences(occurrences)))
+        return DictTuple(graphemes)
+
+    @lazyproperty
+    def sounds(self):
+        sounds = []
+        for sound in self.wordlist.sounds:
+            occurrences = self._occurrences(sound)
+            if occurrences:
+                sounds.append(attr.evolve(
+                    sound,
+                    wordlist=self,
+                    occurrences=occurrences,
+                    forms=self._forms_in_occurrences(occurrences)))
+        return Sounds(sounds)
@@ -1,3 +1,4 @@
+import shutil
 import pathlib
 
 import pytest
@@ -22,6 +23,18 @@ def clts(repos):
     return CLTS(repos / 'clts')
 
 
+@pytest.fixture
+def bipa_modified(repos, tmp_path):
+    """
+    BIPA from a copy of the CLTS data with an additional normalization.
+    """
+    shutil.copytree(str(repos / 'clts'), str(tmp_path / 'clts'))
+    with (tmp_path / 'clts' / 'pkg' / 'transcriptionsystems' / 'bipa' / 'normalize.tsv').open(
+            'a', encoding='utf8') as f:
+        f.write('g\tɡ\n')
+    return CLTS(tmp_path / 'clts').bipa
+
+
 @pytest.fixture
 def concepticon(repos):
     return Concepticon(repos / "concepticon")
@@ -0,0 +1,104 @@
+import time
+import threading
+import concurrent.futures
+
+from cltoolkit import Wordlist
+from cltoolkit.cache import CacheManager, cached_property
+
+
+class Thing:
+    wordlist = None
+
+    def __init__(self, id):
+        self.id = id
+
+    @cached_property
+    def things(self):
+        return [self.id] * 3
+
+
+def test_CacheManager():
+    cache = CacheManager(maxsize=2)
+    objs = [Thing(i) for i in range(3)]
+    for obj in objs:
+        assert cache.get(obj, 'x', lambda o: o.id) == obj.id
+    assert len(cache) == 2
+    assert cache.get(objs[2], 'x', lambda o: None) == 2
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.evictions) == (1, 3, 1)
+
+    cache = CacheManager(maxitems=5)
+    cache.get(objs[0], 'x', lambda o: [1, 2, 3])
+    cache.get(objs[1], 'x', lambda o: [1, 2, 3])
+    assert len(cache) == 1 and cache.cache_info().curritems == 3
+    cache.clear()
+    assert len(cache) == 0 and cache.cache_info().curritems == 0
+
+
+def test_CacheManager_threads():
+    cache, thing, calls = CacheManager(), Thing(1), []
+
+    def compute(obj):
+        calls.append(obj)
+        time.sleep(0.05)
+        return obj.id
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        res = list(executor.map(lambda _: cache.get(thing, 'x', compute), range(8)))
+    assert res == [1] * 8
+    assert len(calls) == 1
+    assert cache.cache_info().misses == 1 and cache.cache_info().hits == 7
+
+
+def test_cached_property():
+    thing = Thing(1)
+    assert thing.things == [1, 1, 1]
+    assert thing.__dict__['things'] is thing.things
+    assert isinstance(Thing.things, cached_property)
+
+    thing, barrier = Thing(2), threading.Barrier(4)
+
+    def get(_):
+        barrier.wait()
+        return thing.things
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        res = list(executor.map(get, range(4)))
+    assert all(r is res[0] for r in res)
+
+
+def test_Wordlist_cache(ds_carvalhopurus, clts):
+    wl = Wordlist([ds_carvalhopurus], clts.bipa, cache=CacheManager(maxsize=2))
+    inventories = [lg.sound_inventory for lg in wl.languages]
+    assert 'sound_inventory' not in wl.languages[0].__dict__
+    assert wl.cache.cache_info().evictions > 0
+    assert wl.languages[-1].sound_inventory is inventories[-1]
+    assert wl.languages[0].sound_inventory is not inventories[0]
+    assert len(wl.languages[0].sound_inventory) == len(inventories[0])
+    wl.clear_caches()
+    assert len(wl.cache) == 0
+
+
+def test_CacheManager_lru():
+    cache = CacheManager(maxsize=2)
+    objs = [Thing(i) for i in range(3)]
+    cache.get(objs[0], 'x', lambda o: o.id)
+    cache.get(objs[1], 'x', lambda o: o.id)
+    # Recently used values survive eviction:
+    assert cache.get(objs[0], 'x', lambda o: None) == 0
+    cache.get(objs[2], 'x', lambda o: o.id)
+    assert cache.get(objs[0], 'x', lambda o: None) == 0
+    assert cache.get(objs[1], 'x', lambda o: None) is None
+
+
+def test_lazyproperty_threads():
+    things, barrier = [Thing(i) for i in range(4)], threading.Barrier(8)
+
+    def get(i):
+        barrier.wait()
+        return things[i % 4].things
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        res = list(executor.map(get, range(8)))
+    assert all(res[i] is res[i + 4] for i in range(4))
+    assert not Thing.things._pending
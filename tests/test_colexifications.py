@@ -0,0 +1,41 @@
+import itertools
+
+from cltoolkit import Wordlist
+from cltoolkit.colexifications import Edge, write_edges, read_edges
+from cltoolkit.features.lexicon import PartialColexification
+
+
+def test_colexifications(ds_wangbcd, ds_features, clts, tmp_path):
+    wl = Wordlist([ds_wangbcd, ds_features], clts.bipa)
+    edges = wl.colexifications()
+    assert edges[0] == Edge('LIE (REST)', 'SLEEP', 4, 2)
+
+    # Compare with the colexifications computed language by language:
+    expected = {}
+    for language in wl.languages:
+        for a, b in itertools.combinations(sorted(c.id for c in language.concepts), 2):
+            aforms = {f.form for f in language.concepts[a].forms if f.form}
+            if aforms & {f.form for f in language.concepts[b].forms}:
+                expected.setdefault((a, b), []).append(language)
+    assert {(e.source, e.target): e.languages for e in edges} == \
+        {k: len(v) for k, v in expected.items()}
+    assert all(e.families <= e.languages for e in edges)
+    assert all(e.languages >= 2 for e in wl.colexifications(min_languages=2))
+
+    for name in ['edges.tsv', 'edges.tsv.gz']:
+        assert write_edges(iter(edges), tmp_path / name) == len(edges)
+        assert list(read_edges(tmp_path / name)) == edges
+
+
+def test_partial_colexifications(ds_wangbcd, ds_features, clts):
+    wl = Wordlist([ds_wangbcd, ds_features], clts.bipa)
+    edges = wl.partial_colexifications()
+    assert edges
+
+    # Compare with the feature computed language by language:
+    expected = {}
+    for language in wl.languages:
+        for a, b in itertools.permutations([c.id for c in language.concepts], 2):
+            if PartialColexification(a, b)(language):
+                expected[a, b] = expected.get((a, b), 0) + 1
+    assert {(e.source, e.target): e.languages for e in edges} == expected
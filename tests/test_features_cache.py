@@ -0,0 +1,57 @@
+import time
+
+from cltoolkit import Wordlist
+from cltoolkit.features import FEATURES, FeatureCollection
+from cltoolkit.features.cache import ResultCache
+
+
+def test_ResultCache(ds_carvalhopurus, clts, tmp_path):
+    wl = Wordlist([ds_carvalhopurus], clts.bipa)
+    expected = FEATURES.compute(wl).to_values()
+
+    with ResultCache(tmp_path / 'cache.sqlite') as cache:
+        assert FEATURES.compute(wl, cache=cache).to_values() == expected
+        assert cache.hits == 0 and len(cache) == len(wl.languages) * len(FEATURES)
+
+    with ResultCache(tmp_path / 'cache.sqlite') as cache:
+        assert FEATURES.compute(wl, cache=cache, threads=2).to_values() == expected
+        assert cache.misses == 0
+
+        # Languages with the same content are served from the same cache entries:
+        view = wl.view(languages=['carvalhopurus-Apurina'])
+        assert view.languages[0].content_fingerprint == wl.languages[1].content_fingerprint
+        hits = cache.hits
+        FEATURES.compute(view, cache=cache)
+        assert cache.hits == hits + len(FEATURES)
+
+        # Only new features are computed:
+        fc = FeatureCollection(list(FEATURES)[:3])
+        cache.clear()
+        fc.compute(wl, cache=cache)
+        res = FEATURES.compute(wl, cache=cache, jobs=2)
+        assert res.to_values() == expected
+        assert cache.hits == hits + len(FEATURES) + 3 * len(wl.languages)
+
+        cache.maxsize = 5
+        cache.evict()
+        assert len(cache) == 5
+        cache.max_age = 0
+        time.sleep(0.01)
+        cache.evict()
+        assert len(cache) == 0
+
+    # Values which do not survive the JSON round trip are not cached:
+    with ResultCache(tmp_path / 'cache.sqlite') as cache:
+        cache.set({b'a': ('x', 1), b'b': {1: 'x'}, b'c': {'1': ['x']}, b'd': object()})
+        assert cache.get([b'a', b'b', b'c', b'd']) == {b'c': {'1': ['x']}}
+
+
+def test_ResultCache_ts(ds_carvalhopurus, clts, bipa_modified, tmp_path):
+    features = FeatureCollection(list(FEATURES)[:3])
+    with ResultCache(tmp_path / 'cache.sqlite') as cache:
+        features.compute(Wordlist([ds_carvalhopurus], clts.bipa), cache=cache)
+        # Values computed with different data of the transcription system are not re-used:
+        features.compute(Wordlist([ds_carvalhopurus], bipa_modified), cache=cache)
+        assert cache.hits == 0 and cache.misses == len(cache) == 2 * 3 * 4
+        features.compute(Wordlist([ds_carvalhopurus], clts.bipa), cache=cache)
+        assert cache.hits == 3 * 4
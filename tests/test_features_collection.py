@@ -33,10 +33,30 @@ def test_FeatureCollection(ds_carvalhopurus, clts, tmp_path):
     fc = FeatureCollection.load(tmp_path / 'test.json')
     for s, o in zip(FEATURES, fc):
         assert s.id == o.id and s.categories == o.categories
+
+    fc = FeatureCollection([f for f in FEATURES if f.id in ['ConsonantQualitySize', 'LegAndFoot']])
+    res = fc.compute(wl)
+    assert res.languages == [lg.id for lg in wl.languages]
+    assert res['carvalhopurus-Apurina', 'ConsonantQualitySize'] == \
+        FEATURES('ConsonantQualitySize', wl.languages['carvalhopurus-Apurina'])
+    assert res.to_values() == fc.compute(wl, threads=4).to_values()
+    assert res.to_values() == fc.compute(wl, jobs=2).to_values()
+    assert fc.compute(wl, languages=wl.languages[:1]).shape == (1, 2)
+    assert len(dict(fc.iter_values(wl, jobs=2))) == len(wl.languages)
     #assert all(s.id == o.id and s.categories == o.categories
     #           for s, o in zip(FEATURES.features, fc.features))
 
 
+def test_compute_jobs_concurrently(ds_carvalhopurus, ds_wangbcd, clts):
+    import concurrent.futures
+
+    fc = FeatureCollection([f for f in FEATURES if f.id in ['ConsonantQualitySize', 'LegAndFoot']])
+    wls = [Wordlist([ds], clts.bipa) for ds in [ds_carvalhopurus, ds_wangbcd]]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        res = list(executor.map(lambda wl: fc.compute(wl, jobs=2).to_values(), wls))
+    assert res == [fc.compute(wl).to_values() for wl in wls]
+
+
 def test_concepticon(concepticon):
     valid_glosses = set([c.gloss for c in concepticon.conceptsets.values()])
     for feature in FEATURES:
@@ -55,3 +75,51 @@ def test_clts(clts):
                 for feature in featureset:
                     if feature not in clts.bipa.feature_system:  # pragma: no cover
                         raise ValueError("feature value {0} not in clts".format(feature))
+
+
+def test_intermediates(ds_carvalhopurus, clts, capsys):
+    from cltoolkit.features.reqs import MissingRequirement
+    from cltoolkit.features.intermediates import Intermediates
+
+    wl = Wordlist([ds_carvalhopurus], clts.bipa)
+    language = wl.languages['carvalhopurus-Apurina']
+    expected = {}
+    for feature in FEATURES:
+        try:
+            expected[feature.id] = feature(language)
+        except MissingRequirement:  # pragma: no cover
+            expected[feature.id] = None
+    assert FEATURES.values(language) == expected
+
+    intermediates = Intermediates(language)
+    FEATURES['SyllableOnset'](language, intermediates=intermediates)
+    syllables = intermediates['syllable_complexity']
+    FEATURES['SyllableOffset'](language, intermediates=intermediates)
+    assert intermediates['syllable_complexity'] is syllables
+    assert intermediates['inventory.consonants'] is language.sound_inventory.consonants
+    with pytest.raises(KeyError):
+        _ = intermediates['xyz']
+
+    plan = FEATURES.plan()
+    assert plan['syllable_complexity'] == ['SyllableStructure', 'SyllableOnset', 'SyllableOffset']
+    assert 'ConsonantSize' in plan['inventory'] and 'inventory.consonants' not in plan
+    FEATURES.explain()
+    out, _ = capsys.readouterr()
+    assert 'syllable_complexity (3 features)' in out and 'without intermediates' in out
+
+
+def test_intermediates_signature(ds_carvalhopurus, clts):
+    from cltoolkit.features.phonology import InventoryQuery
+
+    class Query(InventoryQuery):
+        def __call__(self, language):
+            return len(language.sound_inventory.consonants)
+
+    fc = FeatureCollection([
+        Feature(id='a', name='a', function=Query('consonants')),
+        Feature(id='b', name='b', function=InventoryQuery('consonants'))])
+    assert not fc['a'].intermediates and fc['b'].intermediates == ['inventory']
+    wl = Wordlist([ds_carvalhopurus], clts.bipa)
+    language = wl.languages[0]
+    values = fc.values(language)
+    assert values['a'] == values['b'] == len(language.sound_inventory.consonants)
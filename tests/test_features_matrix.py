@@ -0,0 +1,50 @@
+import collections
+
+import pytest
+
+from cltoolkit import Wordlist
+from cltoolkit.features import FEATURES, Feature
+from cltoolkit.features.reqs import MissingRequirement
+from cltoolkit.features.matrix import FeatureMatrix
+
+
+def test_FeatureMatrix(ds_carvalhopurus, ds_wangbcd, clts, tmp_path):
+    wl = Wordlist([ds_carvalhopurus, ds_wangbcd], clts.bipa)
+    values = collections.OrderedDict(FEATURES.iter_values(wl))
+    m = FeatureMatrix.from_values(FEATURES, values)
+    assert m.shape == (len(wl.languages), len(FEATURES))
+    assert m.to_values() == values
+    assert m.columns['HasRoundedVowels'].kind == 'category'
+    assert m.columns['ConsonantSize'].values.typecode == 'q'
+    assert m.columns['CVRatio'].kind == 'float'
+    assert m.is_missing('wangbcd-Beijing', 'ConsonantSize')
+    assert 'wangbcd-Beijing' in m
+
+    lid = 'carvalhopurus-Apurina'
+    value = m[lid, 'HasRoundedVowels']
+    assert m.labels('HasRoundedVowels')[0] == \
+        FEATURES['HasRoundedVowels'].categories[value]
+    assert m.labels('LegAndFoot')[-1] == 'missing data'
+
+    sub = m.select(languages=[lid], features=['ConsonantSize', 'HasRoundedVowels'])
+    assert sub.shape == (1, 2)
+    assert sub.row(lid) == \
+        {k: v for k, v in values[lid].items() if k in ['ConsonantSize', 'HasRoundedVowels']}
+    assert m.select().column('CVRatio') == m.column('CVRatio')
+
+    m.save(tmp_path / 'matrix')
+    loaded = FeatureMatrix.load(tmp_path / 'matrix')
+    assert loaded.to_values() == values
+    assert loaded.labels('HasRoundedVowels') == m.labels('HasRoundedVowels')
+    (tmp_path / 'invalid').write_bytes(b'abc')
+    with pytest.raises(ValueError):
+        FeatureMatrix.load(tmp_path / 'invalid')
+
+    f = Feature(id='x', name='x', function=lambda lg: lg.id, categories={'a': 'A'})
+    m = FeatureMatrix([f, Feature(id='y', name='y', function=str)], ['a', 'b', 'c'])
+    with pytest.raises(ValueError):
+        m['a', 'x'] = 'b'
+    m['a', 'y'], m['b', 'y'], m['c', 'y'] = 'u', MissingRequirement(), 'v'
+    assert m.column('y') == ['u', None, 'v']
+    with pytest.raises(ValueError):
+        FeatureMatrix([f], ['a', 'a'])
@@ -31,4 +31,34 @@ def test_requires(caplog):
     with caplog.at_level(logging.DEBUG):
         with pytest.raises(ValueError):
             f(Namespace(dataset='xyz'))
-    assert 'xyz' in caplog.records[-1].message
\ No newline at end of file
+    assert 'xyz' in caplog.records[-1].message
+
+
+def test_capabilities(ds_carvalhopurus, ds_wangbcd, clts):
+    from cltoolkit import Wordlist
+    from cltoolkit.features import Feature, FeatureCollection
+
+    wl = Wordlist([ds_carvalhopurus, ds_wangbcd], clts.bipa)
+    apurina, beijing = wl.languages['carvalhopurus-Apurina'], wl.languages['wangbcd-Beijing']
+    assert apurina.capabilities == {
+        'inventory', 'inventory_with_occurrences', 'graphemes', 'concepts'}
+    assert beijing.capabilities == {'concepts'}
+    for lg in wl.languages:
+        for req in [inventory, inventory_with_occurrences, graphemes, concepts]:
+            assert is_met(req, lg) == req(lg)
+    assert wl.languoids['mand1415'].capabilities == {'concepts'}
+
+    calls = []
+
+    @requires(inventory)
+    def f(language):
+        calls.append(language)
+        return True
+
+    feature = Feature(id='f', name='f', function=f)
+    assert eligible(feature, apurina) and not eligible(feature, beijing)
+    res = FeatureCollection([feature]).values(beijing)
+    assert res['f'] is None and not calls
+    with pytest.raises(MissingRequirement):
+        f(beijing)
+    assert not calls
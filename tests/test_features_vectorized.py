@@ -0,0 +1,18 @@
+from cltoolkit import Wordlist
+from cltoolkit.features import FEATURES
+from cltoolkit.features.phonology import InventoryQuery, Ratio, HasEngma
+from cltoolkit.features.vectorized import IncidenceMatrix, compile_feature, compute
+
+
+def test_compute(ds_carvalhopurus, ds_wangbcd, ds_features, clts):
+    wl = Wordlist([ds_carvalhopurus, ds_wangbcd, ds_features], clts.bipa)
+    assert compute(FEATURES, wl).to_values() == FEATURES.compute(wl).to_values()
+
+    matrix = IncidenceMatrix(wl, languages=wl.languages[:2])
+    assert matrix.languages == [lg.id for lg in wl.languages[:2]]
+    assert bin(matrix.rows[wl.languages[0].id]).count('1') == len(wl.languages[0].sound_inventory)
+    assert compile_feature(InventoryQuery('consonants_by_quality'), matrix) is None
+    assert compile_feature(Ratio('consonants', 'vowels_by_quality'), matrix) is None
+    assert compile_feature(HasEngma(), matrix) is None
+    assert compile_feature(Ratio('consonants', 'vowels'), matrix)(
+        matrix.rows[wl.languages[0].id]) == FEATURES['CVRatio'](wl.languages[0])
@@ -22,3 +22,35 @@ from cltoolkit.features.lexicon import Colexification, PartialColexification, Sh
 def test_colexification(repos, ds_features, clts, func, res):
     wl = Wordlist([ds_features], clts.bipa)
     assert func(wl.languages[0]) is res
+
+
+@pytest.mark.parametrize(
+    'func,aforms,bforms,res',
+    [
+        (SharedSubstring, ['abcde'], ['xabcx'], True),
+        (SharedSubstring, ['abcd'], ['xabcx'], False),
+        (SharedSubstring, ['abcd'], ['xbcdx'], True),
+        # A form identical to the first part of a split does not count:
+        (SharedSubstring, ['abcbc'], ['ab'], False),
+        (SharedSubstring, ['abcabc'], ['abc'], False),
+        (SharedSubstring, ['xabc'], ['abc'], True),
+        (SharedSubstring, ['abc'], [], None),
+        (PartialColexification, ['abc'], ['abcdef'], True),
+        (PartialColexification, ['abc'], ['xyzabc'], True),
+        (PartialColexification, ['abc'], ['abcde'], False),
+        (PartialColexification, ['ab'], ['abcdef'], False),
+        (PartialColexification, ['abc'], ['xabcxyz'], False),
+    ]
+)
+def test_substring_comparison(func, aforms, bforms, res):
+    assert func('A', 'B').run(aforms, bforms, []) is res
+
+
+def test_concept_forms(ds_features, clts):
+    wl = Wordlist([ds_features], clts.bipa)
+    language = wl.languages[0]
+    assert language.concept_forms['HAND'] == frozenset(
+        f.form for f in language.concepts['HAND'].forms)
+    assert language.concept_forms is language.concept_forms
+    aforms, bforms, abforms = Colexification(["HAND", "ARM"], "FOOT").forms(language)
+    assert aforms == language.concept_forms['HAND'] | language.concept_forms['ARM']
@@ -0,0 +1,31 @@
+import pytest
+
+from cltoolkit import Wordlist
+from cltoolkit.lsh import MinHashIndex
+
+
+def test_MinHashIndex(ds_carvalhopurus, ds_wangbcd, clts):
+    wl = Wordlist([ds_carvalhopurus, ds_wangbcd], clts.bipa)
+    with pytest.raises(ValueError):
+        MinHashIndex(num_perm=10, bands=3)
+
+    index = MinHashIndex(wl.languages, bands=64)
+    assert len(index) == len(wl.languages) and wl.languages[0] in index
+    assert index.languages[0] == wl.languages[0]
+    with pytest.raises(ValueError):
+        index.add(wl.languages[0])
+
+    language = wl.languages['carvalhopurus-Apurina']
+    res = index.query(language, k=2)
+    assert len(res) == 2 and language not in [lg for lg, _ in res]
+    assert all(0 < sim <= 1 for _, sim in res)
+
+    res = index.query(language, k=20, exact=True)
+    expected = sorted(
+        [(lg, language.sound_inventory.strict_similarity(lg.sound_inventory))
+         for lg in wl.languages if lg != language],
+        key=lambda i: -i[1])
+    assert res == [r for r in expected if r[1] > 0.3]
+
+    index = MinHashIndex(wl.languages, aspect='tones')
+    assert not index.query(language)
@@ -1,9 +1,11 @@
+import copy
+
 import pytest
 
 from cltoolkit import Wordlist
 from cltoolkit.models import (
         CLCore, WithForms, WithDataset,
-        Language, Sense, Form, Sound,
+        Language, Sense, Form, Sound, LanguageSound,
         Inventory)
 
 
@@ -35,6 +37,8 @@ def test_core_models(clts, ds_dummy):
 
     assert len(wl.forms[0].sound_objects) == len(wl.forms[0].graphemes) == len(
             wl.forms[0].sounds)
+    assert [wl.sounds[i] for i in wl.forms[0].sound_ids] == wl.forms[0].sound_objects
+    assert [str(g) for g in wl.forms[0].grapheme_objects] == list(wl.forms[0].graphemes)
     assert len(wl.sounds[0]) == 1
     assert wl.sounds[0].__eq__(wl.sounds[1]) == False
     assert wl.sounds[0].name == 'voiced bilabial nasal consonant'
@@ -70,8 +74,29 @@ def test_core_models(clts, ds_dummy):
 
     assert form.sound_objects[0] != form.grapheme_objects[0]
     assert str(form.grapheme_objects[0]) == str(form.sound_objects[0])
+    assert form.sound_ids and form.grapheme_ids
     
 
+def test_LanguageSound(clts, ds_dummy):
+    wl = Wordlist([ds_dummy], clts.bipa)
+    lang = wl.languages[0]
+    sound = lang.sound_inventory.sounds[0]
+    assert isinstance(sound, LanguageSound)
+    assert sound.obj is wl.sounds[sound.id].obj
+    assert sound.language is lang
+    assert sound.occurrences == wl.sounds[sound.id].occurrences[lang.id]
+    assert len(sound) == len(sound.occurrences)
+    assert all(form.language == lang for form in sound.forms)
+    assert sound == wl.sounds[sound.id] and wl.sounds[sound.id] == sound
+    assert str(sound) == sound.grapheme and repr(sound) == '<LanguageSound m>'
+
+    sound_copy = copy.copy(sound)
+    assert sound_copy.sound is sound.sound and sound_copy.language is sound.language
+    assert sound_copy == sound and sound_copy.grapheme == sound.grapheme
+    with pytest.raises(AttributeError):
+        LanguageSound.__new__(LanguageSound).grapheme
+
+
 def test_inventory(clts):
     invA = Inventory.from_list(clts.bipa, "a", "u", "p", "k")
     invB = Inventory.from_list(clts.bipa, "a", "u", "b", "g")
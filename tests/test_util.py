@@ -1,12 +1,23 @@
+import os
+import sys
+import pickle
+import subprocess
+
+import pytest
 from lingpy.basictypes import lists
+from lingpy.sequence.sound_classes import syllabify
 
 from cltoolkit.models import Form
 from cltoolkit.util import (
     identity,
     jaccard,
     iter_syllables,
+    syllabify_tokens,
+    syllable_spans,
+    sonority,
     valid_sounds,
     DictTuple,
+    FeatureBits,
     datasets_by_id,
 )
 
@@ -27,6 +38,41 @@ def test_DictTuple():
     d = DictTuple([C()])
     assert C() in d
     assert 5 in d
+    assert 'x' not in d
+    assert d.get('x') is None
+
+    d = DictTuple(list('cabac'), key=identity)
+    assert d.position('c') == 0 and d.position('b') == 2
+    assert list(d.items()) == [('c', 'c'), ('a', 'a'), ('b', 'b')]
+    assert d[1:3] == ('a', 'b')
+    with pytest.raises(KeyError):
+        d.position('x')
+    with pytest.raises(KeyError):
+        _ = d['x']
+
+    d = DictTuple(list('cabac'), key=identity, multi=True)
+    assert d['a'] == ['a', 'a']
+
+    # Keys need not be comparable with each other:
+    d = DictTuple(['a', None, 1, ('x', 2), None], key=identity, multi=True)
+    assert d[None] == [None, None] and d[('x', 2)] == [('x', 2)] and 1 in d
+    assert 'b' not in d and [] not in d
+
+
+def test_DictTuple_pickle(tmp_path):
+    d = DictTuple(list('cab'), key=identity, multi=True)
+    assert pickle.loads(pickle.dumps(d))['a'] == ['a']
+
+    # The index must be re-built when unpickling in a process with different string hashes:
+    def run(seed, code):
+        subprocess.check_call(
+            [sys.executable, '-c', 'import pickle, pathlib; p = pathlib.Path(r"{}"); {}'.format(
+                tmp_path / 'd.pickle', code)],
+            env=dict(os.environ, PYTHONHASHSEED=str(seed)))
+
+    run(1, "from cltoolkit.util import DictTuple, identity; "
+           "p.write_bytes(pickle.dumps(DictTuple(list('abcde'), key=identity)))")
+    run(2, "d = pickle.loads(p.read_bytes()); assert 'a' in d and d.get('e') == 'e'")
 
 
 def test_valid_sounds(clts):
@@ -47,4 +93,39 @@ def test_jaccard():
 
 def test_syllables():
     form = Form(id="test", sounds=lists("t a k + t a k"))
+    hits = syllable_spans.cache_info().hits
     assert len(list(iter_syllables(form))) == 2
+    assert syllable_spans.cache_info().hits > hits
+    assert list(iter_syllables(Form(id="x", sounds=lists("t a - t a")))) == [
+        ('t', 'a', '-'), ('t', 'a')]
+    assert syllabify_tokens(('t', 'a', 't', 'a')) == (('t', 'a'), ('t', 'a'))
+
+
+@pytest.mark.parametrize(
+    'tokens',
+    ['t a t a t', 't a ∼ k', 'p a ˥ t a ˥', 'n a _ k a', 'ts i ŋ ◦ k w a ʔ', 's t r a', 'ʔ'])
+def test_syllable_spans(tokens):
+    tokens = tokens.split()
+    assert tuple(tokens[i:j] for i, j in syllable_spans(tuple(sonority(t) for t in tokens))) == \
+        tuple(syllabify(tokens, output='nested'))
+
+
+def test_syllables_from_sound_ids(ds_carvalhopurus, clts):
+    from cltoolkit import Wordlist
+
+    wl = Wordlist([ds_carvalhopurus], clts.bipa)
+    for form in wl.forms_with_sounds:
+        assert form.sound_ids is not None
+        assert list(iter_syllables(form)) == [
+            tuple(s) for m in form.sounds.n for s in syllabify(list(m), output='nested')]
+    assert wl.sounds['a'].sonority == 7
+
+
+def test_FeatureBits():
+    bits = FeatureBits(['nasal', 'bilabial'])
+    assert len(bits) == 2 and bits.bit('nasal') == 1
+    mask = bits.mask({'bilabial', 'nasal', 'voiced', 'consonant'})
+    specs = bits.compile([['velar', 'stop'], ['bilabial', 'nasal']])
+    assert bits.matches(mask, specs)
+    assert not bits.matches(mask, specs[:1])
+    assert bits.matches(mask, bits.compile([[]]))
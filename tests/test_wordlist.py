@@ -1,7 +1,13 @@
+import gc
+import weakref
+import itertools
+
+import pytest
+
 from cltoolkit import Wordlist
 
 from clldutils.path import sys_path
-from cltoolkit.util import lingpy_columns
+from cltoolkit.util import lingpy_columns, WordlistReleasedError
 
 
 def test_Wordlist(repos, ds_carvalhopurus, ds_wangbcd, clts):
@@ -46,8 +52,203 @@ def test_Wordlist(repos, ds_carvalhopurus, ds_wangbcd, clts):
                 assert str(forms[0][0].graphemes) == "m a + n e"
 
             assert wl.coverage(aspect="forms_with_graphemes")[apurina.id] == len(apurina.concepts)
+
+            by_dataset = wl.languages.by('dataset')
+            assert list(by_dataset) == ['carvalhopurus', 'wangbcd']
+            assert sum(len(v) for v in by_dataset.values()) == wl.width
+            assert apurina in wl.languages.by('Family')['Arawakan']
+            assert wl.languages.by('family') == wl.languages.by('Family')
+            assert wl.languages.by(lambda lg: lg.glottocode)[apurina.glottocode][0] == apurina
+            assert wl.languages.by('Family').apply(
+                lambda lg: len(lg.forms), aggregate=sum)['Arawakan'] == \
+                sum(len(lg.forms) for lg in wl.languages if lg.family == 'Arawakan')
     
     wl = Wordlist([datasets[0]], clts.bipa)
     wl.load_cognates()
     lpwl = wl.as_lingpy(columns=lingpy_columns(cognates="default"))
     assert "cognacy" in lpwl.columns
+
+
+def test_WordlistView(ds_carvalhopurus, clts):
+    wl = Wordlist([ds_carvalhopurus], clts.bipa)
+    apurina = wl.languages["carvalhopurus-Apurina"]
+
+    view = wl.view()
+    assert (view.width, view.height, view.length) == (wl.width, wl.height, wl.length)
+    assert len(view.languages[apurina.id].sound_inventory) == len(apurina.sound_inventory)
+
+    view = wl.view(languages=[apurina], concepts=["BODY", "HAND", "HEAD"])
+    assert view.width == 1 and view.height == 3
+    assert all(f is wl.forms[f.id] for f in view.forms)
+    lg = view.languages[0]
+    assert lg.wordlist == view and len(lg.concepts) == 3
+    assert all(c.wordlist == view for c in view.concepts)
+    assert len(lg.forms) == len(view.forms) == sum(len(c.forms) for c in lg.concepts)
+    assert sum(len(s.forms) for s in lg.senses) == len(lg.forms)
+    assert set(s.id for s in lg.sound_inventory) == \
+        set(str(s) for f in lg.forms_with_sounds for s in f.sound_objects)
+    assert len(lg.sound_inventory) < len(apurina.sound_inventory)
+    assert all(len(s.occurrences) <= len(wl.sounds[s.id].occurrences[apurina.id])
+               for s in lg.sound_inventory)
+    assert all(g.forms for g in view.graphemes)
+    assert view.coverage()[lg.id] == 3
+    assert len(list(view.iter_forms_by_concepts())) == 3
+    assert view.as_lingpy().height == 3
+
+    nested = view.view(concepts=["BODY"])
+    assert nested.height == 1 and nested.wordlist is view
+    assert len(nested.languages[0].forms) == len(view.concepts["BODY"].forms)
+    assert nested.sounds
+
+    view = wl.view(concepts=["BODY"])
+    assert view.width == wl.width
+    assert len(view.forms) == len(wl.concepts["BODY"].forms)
+
+
+def test_WordlistView_cache(ds_carvalhopurus, clts):
+    from cltoolkit.cache import CacheManager
+
+    wl = Wordlist([ds_carvalhopurus], clts.bipa, cache=CacheManager(maxsize=100))
+    _ = wl.languages[0].sound_inventory
+    size = len(wl.cache)
+    for lg in wl.languages:
+        view = wl.view(languages=[lg])
+        assert view.cache is not wl.cache and view.cache.maxsize == 100
+        assert view.languages[0].sound_inventory
+        assert len(view.cache)
+    del view
+    gc.collect()
+    assert len(wl.cache) == size
+
+
+def test_Wordlist_merge(ds_carvalhopurus, ds_wangbcd, ds_dummy, clts):
+    full = Wordlist([ds_carvalhopurus, ds_wangbcd, ds_dummy], clts.bipa)
+    wl = Wordlist.merge(
+        Wordlist([ds_carvalhopurus], clts.bipa),
+        Wordlist([ds_wangbcd], clts.bipa),
+        Wordlist([ds_dummy], clts.bipa))
+    assert (wl.width, wl.height, wl.length) == (full.width, full.height, full.length)
+    assert [s.id for s in wl.sounds] == [s.id for s in full.sounds]
+    assert [g.id for g in wl.graphemes] == [g.id for g in full.graphemes]
+    for s in wl.sounds:
+        assert len(s.forms) == len(full.sounds[s.id].forms)
+        assert list(s.occurrences) == list(full.sounds[s.id].occurrences)
+    for c in wl.concepts:
+        assert len(c.forms) == len(full.concepts[c.id].forms)
+    for f in wl.forms:
+        assert f.wordlist == wl
+        assert f.concept is None or f.concept == wl.concepts[f.concept.id]
+        assert [s.id for s in f.sound_objects] == [s.id for s in full.forms[f.id].sound_objects]
+        assert [g.id for g in f.grapheme_objects] == \
+            [g.id for g in full.forms[f.id].grapheme_objects]
+    for lg in wl.languages:
+        assert [s.id for s in lg.sound_inventory] == \
+            [s.id for s in full.languages[lg.id].sound_inventory]
+    assert wl.view(concepts=['HAND']).height == 1
+
+    with pytest.raises(ValueError):
+        Wordlist.merge(Wordlist([ds_dummy], clts.bipa), Wordlist([ds_dummy], clts.bipa))
+    with pytest.raises(ValueError):
+        Wordlist.merge(wl.view())
+
+
+def test_Wordlist_languoids(ds_carvalhopurus, ds_wangbcd, ds_dummy, clts):
+    wl = Wordlist([ds_carvalhopurus, ds_wangbcd, ds_dummy], clts.bipa)
+    assert len(wl.languoids) == len(set(lg.glottocode for lg in wl.languages))
+    languoid = wl.languoids['ganc1239']
+    assert languoid.glottocode == 'ganc1239' and languoid.family == wl.languages[4].family
+    assert [lg.id for lg in languoid.languages] == ['wangbcd-Anyi', 'dummy-Anyi']
+    assert len(languoid.forms) == sum(len(lg.forms) for lg in languoid.languages)
+    assert len(languoid.senses) == sum(len(lg.senses) for lg in languoid.languages)
+    assert set(c.id for c in languoid.concepts) == \
+        set(c.id for lg in languoid.languages for c in lg.concepts)
+    for concept in languoid.concepts:
+        assert len(concept.forms) == sum(
+            len(lg.concepts[concept.id].forms) for lg in languoid.languages
+            if concept.id in lg.concepts)
+
+    inventory = languoid.sound_inventory
+    assert inventory is languoid.sound_inventory
+    assert set(s.id for s in inventory) == \
+        set(s.id for lg in languoid.languages for s in lg.sound_inventory)
+    for sound in inventory:
+        assert len(sound) == sum(
+            len(lg.sound_inventory.sounds[sound.id]) for lg in languoid.languages
+            if sound.id in lg.sound_inventory.sounds)
+    assert len(wl.languoids['apur1254'].sound_inventory) == \
+        len(wl.languages['carvalhopurus-Apurina'].sound_inventory)
+    assert len(wl.view(languages=['dummy-Anyi']).languoids) == 1
+
+
+def test_fingerprints(ds_carvalhopurus, ds_wangbcd, clts, bipa_modified):
+    wl1 = Wordlist([ds_carvalhopurus, ds_wangbcd], clts.bipa)
+    wl2 = Wordlist([ds_carvalhopurus], clts.bipa)
+    assert wl1.dataset_fingerprint('carvalhopurus') == wl2.dataset_fingerprint('carvalhopurus')
+    assert wl2.dataset_fingerprint('wangbcd') != wl1.dataset_fingerprint('wangbcd')
+    assert wl2.dataset_fingerprint('wangbcd') == wl2.dataset_fingerprint('xyz')
+    assert wl1.fingerprint != wl2.fingerprint
+    assert wl2.fingerprint == Wordlist([ds_carvalhopurus], clts.bipa).fingerprint
+    assert wl2.fingerprint != Wordlist([ds_carvalhopurus]).fingerprint
+    # Fingerprints depend on the data of the transcription system:
+    wl3 = Wordlist([ds_carvalhopurus], bipa_modified)
+    assert wl2.fingerprint != wl3.fingerprint
+    assert wl2.languages[0].fingerprint != wl3.languages[0].fingerprint
+
+    lg1, lg2 = wl1.languages[0], wl2.languages[0]
+    assert lg1.fingerprint == lg2.fingerprint
+    assert lg1.concepts[0].fingerprint == lg2.concepts[0].fingerprint
+    for c in wl1.concepts:
+        if c.id in wl2.concepts:
+            assert (c.fingerprint == wl2.concepts[c.id].fingerprint) == \
+                (len(c.forms) == len(wl2.concepts[c.id].forms))
+
+    form = lg1.forms[0]
+    assert form.fingerprint != form.content_fingerprint
+    form.id = 'x'
+    del form.__dict__['fingerprint']
+    assert form.fingerprint != lg2.forms[0].fingerprint
+    assert form.content_fingerprint == lg2.forms[0].content_fingerprint
+
+
+def test_Wordlist_close(ds_carvalhopurus, clts):
+    gc.collect()
+    gc.disable()
+    try:
+        wl = Wordlist([ds_carvalhopurus], clts.bipa)
+        _ = [lg.sound_inventory for lg in wl.languages]
+        refs = [weakref.ref(o) for o in itertools.chain(wl.languages, wl.forms, wl.sounds)]
+        wl.close()
+        assert len(wl.forms) == 0 and len(wl.cache) == 0
+        del wl, _
+        # Without reference cycles, all objects are freed without garbage collection:
+        assert not any(ref() for ref in refs)
+    finally:
+        gc.enable()
+
+
+def test_Wordlist_released(ds_carvalhopurus, clts):
+    wl = Wordlist([ds_carvalhopurus], clts.bipa)
+    form = wl.forms[0]
+    assert form.language == wl.languages[form.language.id]
+    assert form.language is not wl.languages[form.language.id]
+    del wl, form
+
+    with pytest.raises(WordlistReleasedError, match='keep a reference to the Wordlist'):
+        for lg in Wordlist([ds_carvalhopurus], clts.bipa).languages:
+            _ = lg.sound_inventory
+    with pytest.raises(ReferenceError):
+        _ = Wordlist([ds_carvalhopurus], clts.bipa).forms_with_sounds[0].sound_objects
+
+
+def test_Sounds_where(ds_carvalhopurus, clts):
+    wl = Wordlist([ds_carvalhopurus], clts.bipa)
+    assert [str(s) for s in wl.sounds.where(['bilabial', 'nasal'])] == ['m', 'm̥']
+    assert [str(s) for s in wl.sounds.where([['bilabial', 'nasal'], ['velar', 'stop']])] == \
+        ['m', 'k', 'm̥']
+    assert not wl.sounds.where(['bilabial', 'nasal', 'click'])
+    for spec in [[], [[]], [['nasal'], []]]:
+        with pytest.raises(ValueError):
+            wl.sounds.where(spec)
+    assert wl.sounds._lock is not wl.view().sounds._lock
+    nasals = wl.view(languages=[wl.languages[0]]).sounds.where(['nasal'])
+    assert nasals and all(s in wl.sounds.where(['nasal']) for s in nasals)